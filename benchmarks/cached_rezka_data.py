@@ -0,0 +1,151 @@
+# NOTE: compares the slotted `CachedRezkaData` against the previous pydantic model;
+#       run from the project root with a valid config.yml: `poetry run python -m benchmarks.cached_rezka_data`
+from pydantic import BaseModel, Field
+from rezka_api_sdk.models import DirectURLsModel
+from time import perf_counter
+
+import gc
+import tracemalloc
+import typing
+
+from src.models import CachedRezkaData
+
+
+SEASONS_COUNT = 10
+EPISODES_PER_SEASON_COUNT = 24
+QUALITIES = ("360p", "480p", "720p", "1080p", "1080p Ultra")
+TRANSLATOR_TITLE = "HDrezka Studio"
+ROUNDS = 50
+
+
+class PydanticCachedRezkaData(BaseModel):
+    item_id: str
+    item_title: str
+    translator_id: str
+    translator_title: str
+    translator_additional_arguments: dict[str, str] = Field(default_factory=dict)
+    is_film: bool
+    season_id: str | None
+    episode_id: str | None
+    seasons: dict[str, str] | None
+    episodes: dict[str, dict[str, str]] | None
+    urls: dict[str, str] | None
+    subtitles: dict[str, str] | None
+    subtitle_languages: dict[str, str] | None
+    urls_expires_at: float | None = Field(default=None)
+
+
+def _get_responses() -> list[tuple[str, str, DirectURLsModel]]:
+    seasons = {
+        str(season_id): f"Сезон {season_id}"
+        for season_id in range(1, SEASONS_COUNT + 1)
+    }
+
+    episodes = {
+        season_id: {
+            str(episode_id): f"Серия {episode_id}"
+            for episode_id in range(1, EPISODES_PER_SEASON_COUNT + 1)
+        }
+        for season_id in seasons
+    }
+
+    return [
+        (
+            season_id,
+            episode_id,
+            DirectURLsModel.model_validate(dict(
+                seasons = seasons,
+                episodes = episodes,
+                urls = {
+                    "".join(quality): f"https://stream.example/{season_id}/{episode_id}/{quality.replace(' ', '_')}.mp4"
+                    for quality in QUALITIES
+                },
+                subtitles = None,
+                subtitle_languages = None
+            ))
+        )
+        for season_id in seasons
+        for episode_id in episodes[season_id]
+    ]
+
+
+def _build_all(
+    build: typing.Callable[[str, str, DirectURLsModel], typing.Any],
+    responses: list[tuple[str, str, DirectURLsModel]]
+) -> list[typing.Any]:
+    return [
+        build(season_id, episode_id, response)
+        for season_id, episode_id, response in responses
+    ]
+
+
+def _measure(
+    name: str,
+    build: typing.Callable[[str, str, DirectURLsModel], typing.Any],
+    responses: list[tuple[str, str, DirectURLsModel]]
+) -> None:
+    fill_times: list[float] = []
+
+    for _ in range(ROUNDS):
+        started_at = perf_counter()
+        _build_all(build, responses)
+        fill_times.append(perf_counter() - started_at)
+
+    gc.collect()
+    tracemalloc.start()
+
+    entries = _build_all(build, responses)
+
+    memory_usage, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print("{:<10} {:>10.1f} bytes/entry {:>10.2f} us/entry".format(
+        name,
+        memory_usage / len(entries),
+        min(fill_times) / len(responses) * 1_000_000
+    ))
+
+
+def _build_pydantic(season_id: str, episode_id: str, response: DirectURLsModel) -> PydanticCachedRezkaData:
+    return PydanticCachedRezkaData(
+        item_id = "12345",
+        item_title = "Item",
+        translator_id = "56",
+        translator_title = "".join(TRANSLATOR_TITLE),
+        translator_additional_arguments = {},
+        is_film = False,
+        season_id = season_id,
+        episode_id = episode_id,
+        seasons = None,
+        episodes = None,
+        urls = response.urls,
+        subtitles = response.subtitles,
+        subtitle_languages = response.subtitle_languages
+    )
+
+
+def _build_slotted(season_id: str, episode_id: str, response: DirectURLsModel) -> CachedRezkaData:
+    return CachedRezkaData.from_response(
+        item_id = "12345",
+        item_title = "Item",
+        translator_id = "56",
+        translator_title = "".join(TRANSLATOR_TITLE),
+        translator_additional_arguments = {},
+        is_film = False,
+        season_id = season_id,
+        episode_id = episode_id,
+        response = response
+    )
+
+
+def main() -> None:
+    responses = _get_responses()
+
+    print(f"{len(responses)} episode entries, best of {ROUNDS} rounds")
+
+    _measure("pydantic", _build_pydantic, responses)
+    _measure("slotted", _build_slotted, responses)
+
+
+if __name__ == "__main__":
+    main()
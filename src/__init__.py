@@ -3,21 +3,21 @@ from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.client.telegram import TelegramAPIServer
 from aiogram.client.default import DefaultBotProperties
 from sqlalchemy.ext.asyncio import create_async_engine as create_db_engine
-from rezka_api_sdk import RezkaAPI
 from aiohttp.client_exceptions import ServerDisconnectedError
+from contextlib import suppress
 
 import asyncio
 import logging
 import typing
 
 from src import db, middlewares, utils, constants, background_tasks
-from src.cache import AsyncTimedRezkaCacheData, AsyncTimedRezkaCacheShortInfo
+from src.rezka import RezkaRequestScheduler, ScheduledRezkaAPI, RezkaAPIUnavailableException
+from src.basic_data import TEXTS
+from src.cache import AsyncTimedRezkaCacheData, AsyncTimedRezkaCacheShortInfo, AsyncTimedRezkaCacheSearch, AsyncTimedContentLengthsCache, DBCacheStorage, CacheBus
 from src.handlers import ROUTERS
 from src.config import config
 
 
-REZKA_API_TIMEOUT = 20.
-
 IGNORE_EXCEPTIONS_STR_LIST = (
     "message was deleted",
     "canceled by new editmessagemedia request",
@@ -47,14 +47,27 @@ bot = Bot(
 )
 
 
-rezka_api = RezkaAPI(
+rezka_api = ScheduledRezkaAPI(
     api_key = config.rezka_api_key,
-    timeout = REZKA_API_TIMEOUT
+    scheduler = RezkaRequestScheduler(
+        max_concurrency = config.rezka_api_max_concurrency,
+        rate_limit = config.rezka_api_rate_limit,
+        rate_burst = config.rezka_api_rate_burst
+    ),
+    timeout_min = config.rezka_api_timeout_min,
+    timeout_max = config.rezka_api_timeout_max,
+    breaker_failure_threshold = config.rezka_api_breaker_failures,
+    breaker_reset_time = config.rezka_api_breaker_reset_time,
+    hedge_percentile = config.rezka_api_hedge_percentile,
+    hedge_budget_ratio = config.rezka_api_hedge_budget,
+    api_urls = config.rezka_api_urls or (
+        [config.rezka_api_url]
+        if config.rezka_api_url
+        else
+        None
+    )
 )
 
-if config.rezka_api_url:
-    rezka_api.API_URL = config.rezka_api_url  # type: ignore
-
 
 logging.getLogger('sqlalchemy.engine.Engine').disabled = True
 
@@ -68,27 +81,81 @@ logger = utils.get_logger(
     logger_file_level = config.logger_file_level
 )
 
+db_engine = create_db_engine(
+    url = config.db_url,
+    echo = True
+)
+
+db_sessionmaker = db.DBSessionMaker(
+    bind = db_engine,
+    expire_on_commit = False,
+    autoflush = False
+)
+
+cache_storage = (
+    DBCacheStorage(
+        db_sessionmaker = db_sessionmaker
+    )
+    if config.cache_persistent
+    else
+    None
+)
+
 rezka_cache_data = AsyncTimedRezkaCacheData(
     rezka_api = rezka_api,
-    expiration_time = config.cache_rezka_data_time
+    expiration_time = config.cache_rezka_data_time,
+    max_entries = config.cache_rezka_data_max_entries,
+    max_bytes = config.cache_rezka_data_max_bytes,
+    storage = cache_storage,
+    storage_namespace = "rezka_data",
+    stale_time = config.cache_rezka_data_soft_time,
+    negative_expiration_time = config.cache_rezka_negative_time,
+    premium_expiration_time = config.cache_rezka_premium_time,
+    stale_if_error_time = config.cache_rezka_stale_if_error_time,
+    force_refresh_interval = config.cache_rezka_force_refresh_interval,
+    prefetch_concurrency = config.rezka_prefetch_concurrency
 )
 
 rezka_cache_short_info = AsyncTimedRezkaCacheShortInfo(
     rezka_api = rezka_api,
-    expiration_time = config.cache_rezka_data_time
+    expiration_time = config.cache_rezka_short_info_time,
+    max_entries = config.cache_rezka_short_info_max_entries,
+    max_bytes = config.cache_rezka_short_info_max_bytes,
+    storage = cache_storage,
+    storage_namespace = "rezka_short_info",
+    stale_time = config.cache_rezka_short_info_soft_time,
+    negative_expiration_time = config.cache_rezka_negative_time,
+    premium_expiration_time = config.cache_rezka_premium_time,
+    stale_if_error_time = config.cache_rezka_stale_if_error_time
 )
 
-db_engine = create_db_engine(
-    url = config.db_url,
-    echo = True
+rezka_cache_search = AsyncTimedRezkaCacheSearch(
+    rezka_api = rezka_api,
+    expiration_time = config.cache_rezka_search_time,
+    max_entries = config.cache_rezka_search_max_entries
 )
 
-db_sessionmaker = db.DBSessionMaker(
-    bind = db_engine,
-    expire_on_commit = False,
-    autoflush = False
+content_lengths_cache = AsyncTimedContentLengthsCache(
+    expiration_time = config.cache_rezka_data_time,
+    max_entries = constants.CONTENT_LENGTHS_CACHE_MAX_ENTRIES,
+    storage = cache_storage,
+    storage_namespace = "content_lengths"
 )
 
+cache_bus = (
+    CacheBus(
+        db_engine = db_engine
+    )
+    if config.cache_bus
+    else
+    None
+)
+
+if cache_bus is not None:
+    cache_bus.register(rezka_cache_data)
+    cache_bus.register(rezka_cache_short_info)
+    cache_bus.register(content_lengths_cache)
+
 
 for middleware in [
     middlewares.ThrottlingMiddleware(
@@ -115,6 +182,21 @@ async def error_handler(event: types.ErrorEvent) -> None:
     if event.exception.__class__ in IGNORE_EXCEPTIONS_LIST:
         return
 
+    if isinstance(event.exception, RezkaAPIUnavailableException):
+        with suppress(exceptions.TelegramAPIError):
+            if event.update.callback_query:
+                await event.update.callback_query.answer(
+                    text = TEXTS.errors.rezka_unavailable.callback_query,
+                    show_alert = True
+                )
+
+            elif event.update.message:
+                await event.update.message.answer(
+                    text = TEXTS.errors.rezka_unavailable.message
+                )
+
+        return
+
     if isinstance(event.exception, exceptions.TelegramBadRequest) and event.exception.message:
         exception_message: str = event.exception.message.lower()
 
@@ -140,15 +222,28 @@ async def on_startup() -> None:
     logger.info(f"Starting @{bot_username}...")
 
     asyncio.create_task(utils.logger_wrapper(logger, background_tasks.db_track_series_checker(bot, db_sessionmaker, rezka_cache_data, logger)))
-    asyncio.create_task(utils.logger_wrapper(logger, background_tasks.download_items_queue_worker(bot, db_sessionmaker, rezka_cache_data)))
-    asyncio.create_task(utils.logger_wrapper(logger, background_tasks.cleanup_expired_cache_worker(rezka_cache_data, rezka_cache_short_info)))
+
+    for _ in range(config.download_items_queue_workers):
+        asyncio.create_task(utils.logger_wrapper(logger, background_tasks.download_items_queue_worker(bot, db_sessionmaker, rezka_cache_data, content_lengths_cache, logger)))
+
+    asyncio.create_task(utils.logger_wrapper(logger, background_tasks.cleanup_expired_cache_worker(rezka_cache_data, rezka_cache_short_info, rezka_cache_search, content_lengths_cache)))
+
+    if len(config.rezka_api_urls) > 1:
+        asyncio.create_task(utils.logger_wrapper(logger, background_tasks.rezka_upstreams_health_checker(rezka_api)))
+
+    if cache_bus is not None:
+        asyncio.create_task(utils.logger_wrapper(logger, cache_bus.run(logger)))
+
+    if config.cache_warmup:
+        asyncio.create_task(utils.logger_wrapper(logger, background_tasks.warmup_rezka_caches(db_sessionmaker, rezka_cache_data, rezka_cache_short_info, logger)))
 
 
 dispatcher_workflow: dict[str, typing.Any] = dict(
     logger = logger,
     rezka_api = rezka_api,
     rezka_cache_data = rezka_cache_data,
-    rezka_cache_short_info = rezka_cache_short_info
+    rezka_cache_short_info = rezka_cache_short_info,
+    rezka_cache_search = rezka_cache_search
 )
 
 
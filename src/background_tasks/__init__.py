@@ -1,10 +1,14 @@
 from .download_items_queue import download_items_queue_worker
 from .track_series import db_track_series_checker
 from .cleanup_expired_cache import cleanup_expired_cache_worker
+from .warmup_cache import warmup_rezka_caches
+from .rezka_health_check import rezka_upstreams_health_checker
 
 
 __all__ = (
     "download_items_queue_worker",
     "db_track_series_checker",
     "cleanup_expired_cache_worker",
+    "warmup_rezka_caches",
+    "rezka_upstreams_health_checker",
 )
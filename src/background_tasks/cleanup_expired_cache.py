@@ -1,15 +1,25 @@
 import asyncio
 import typing
 
+from src import utils
 from src.cache import AsyncTimedCache
 
 
 CLEANUP_EXPIRED_CACHE_INTERVAL = 1.
+CLEANUP_EXPIRED_CACHE_STORAGE_INTERVAL = 60.
 
 
 async def cleanup_expired_cache_worker(*caches: AsyncTimedCache[typing.Any, typing.Any]) -> None:
+    last_storage_cleanup_time = utils.get_timestamp_float()
+
     while True:
         for cache in caches:
             await cache.clean_expired()
 
+        if utils.get_timestamp_float() - last_storage_cleanup_time >= CLEANUP_EXPIRED_CACHE_STORAGE_INTERVAL:
+            for cache in caches:
+                await cache.clean_expired_storage()
+
+            last_storage_cleanup_time = utils.get_timestamp_float()
+
         await asyncio.sleep(CLEANUP_EXPIRED_CACHE_INTERVAL)
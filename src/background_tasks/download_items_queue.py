@@ -1,93 +1,75 @@
 from aiogram import Bot
 from aiogram.exceptions import TelegramAPIError
-from httpx import AsyncClient
+from httpx import AsyncClient, HTTPError
+from sqlalchemy.exc import SQLAlchemyError
 from contextlib import suppress
-from pathlib import Path
+from uuid import uuid4
 
 import sqlalchemy as sa
-import re
 import asyncio
 import os
-import struct
 
-from src import db, models, utils
-from src.cache import AsyncTimedRezkaCacheData
+from src import db, models, utils, enums, rezka
+from src.cache import AsyncTimedRezkaCacheData, AsyncTimedContentLengthsCache
+from src.downloads import SegmentedDownloader, DownloadException, MP4Info, probe_mp4_file, probe_mp4_url
 from src.basic_data import TEXTS
 from src.config import config
 
 
 SLEEP_TIME = 3.
 DOWNLOAD_EDIT_PROGRESS_DELAY = 1.5
-FILE_NAME_CONSTUCTOR = "item_{}_{}.mp4"
-FILE_CHECK_RESOLUTION_MAX_READ_SIZE = 1024 * 1024 * 1  # 1 MB
+FILE_NAME_SUFFIX = ".mp4"
+FILE_NAME_CONSTUCTOR = "item_{}_{}" + FILE_NAME_SUFFIX
 SEND_VIDEO_TIMEOUT = 60 * 5  # 5 minutes
+DOWNLOAD_LEASE_TIME = 60.
+DOWNLOAD_LEASE_RENEW_DELAY = DOWNLOAD_LEASE_TIME / 3
+DOWNLOAD_MAX_ATTEMPTS = 3
 
 http_client = AsyncClient(
     follow_redirects = True
 )
 
+downloader = SegmentedDownloader(
+    http_client = http_client,
+    segments = config.download_items_queue_segments,
+    retries = config.download_items_queue_segment_retries
+)
 
-WGET_PROGRESS_PATTERN = re.compile(r"(\d+)%")
-
-
-def parse_mp4_atom(data: bytes, offset: int, size: int) -> tuple[str, bytes, int]:
-    if offset + 8 > size:
-        raise ValueError("Atom size is less than 8 bytes")
-
-    atom_size = struct.unpack(">I", data[offset:offset + 4])[0]
-    atom_type = data[offset + 4:offset + 8].decode("ascii")
-
-    if atom_size > 8:
-        atom_data = data[offset + 8:offset + atom_size]
-    else:
-        atom_data = b""
-
-    return (atom_type, atom_data, atom_size)
-
-def find_resolution_in_moov(data: bytes, size: int) -> tuple[int, int] | tuple[None, None]:
-    offset = 0
-
-    while offset < size:
-        try:
-            atom_type, atom_data, atom_size = parse_mp4_atom(data, offset, size)
 
-        except ValueError:
-            break
+async def determine_content_length_by_url(content_lengths_cache: AsyncTimedContentLengthsCache, url: str) -> int:
+    content_length = await content_lengths_cache.get(url)
 
-        if atom_type == "moov":
-            moov_offset = 0
+    if content_length is None:
+        response = await http_client.head(url)
 
-            while moov_offset < len(atom_data):
-                trak_type, trak_data, trak_size = parse_mp4_atom(atom_data, moov_offset, len(atom_data))
+        content_length = int(response.headers["Content-Length"])
 
-                if trak_type == "trak":
-                    trak_offset = 0
+        await content_lengths_cache.set(url, content_length)
 
-                    while trak_offset < len(trak_data):
-                        tkhd_type, tkhd_data, tkhd_size = parse_mp4_atom(trak_data, trak_offset, len(trak_data))
+    return content_length
 
-                        if tkhd_type == "tkhd":
-                            if len(tkhd_data) >= 84: 
-                                width = struct.unpack(">I", tkhd_data[76:80])[0] >> 16  
-                                height = struct.unpack(">I", tkhd_data[80:84])[0] >> 16 
 
-                                return (width, height)
+async def _select_direct_url(content_lengths_cache: AsyncTimedContentLengthsCache, direct_urls: dict[str, str]) -> tuple[str, str] | tuple[None, None]:
+    sorted_direct_urls = utils.sort_direct_urls(direct_urls)
 
-                        trak_offset += tkhd_size
+    content_lengths = await asyncio.gather(
+        *(
+            determine_content_length_by_url(content_lengths_cache, direct_url)
+            for direct_url in sorted_direct_urls.values()
+        ),
+        return_exceptions = True
+    )
 
-                moov_offset += trak_size
+    for (quality, direct_url), content_length in zip(sorted_direct_urls.items(), content_lengths):
+        if isinstance(content_length, BaseException):
+            raise content_length
 
-        offset += atom_size
+        if content_length < config.max_file_upload_size:
+            return (quality, direct_url)
 
     return (None, None)
 
 
-async def determine_content_length_by_url(url: str) -> int:
-    response = await http_client.head(url)
-
-    return int(response.headers["Content-Length"])
-
-
 async def _edit_users_message(bot: Bot, db_download_item_queue: db.DownloadItemQueue, text: str) -> None:
     for user_tg_id, user_tg_message_id in zip(db_download_item_queue.user_tg_ids, db_download_item_queue.user_tg_message_ids):
         with suppress(TelegramAPIError):
@@ -100,26 +82,132 @@ async def _edit_users_message(bot: Bot, db_download_item_queue: db.DownloadItemQ
         await asyncio.sleep(config.download_items_queue_per_message_delay)
 
 
-def determine_content_resolution_by_file_content(file_path: Path) -> tuple[int, int] | tuple[None, None]:
-    with file_path.open("rb") as file:
-        data = file.read(FILE_CHECK_RESOLUTION_MAX_READ_SIZE)
-
-    return find_resolution_in_moov(data, len(data))
+async def _claim_download_item_queue(db_session: db.DBSession, worker_id: str) -> db.DownloadItemQueue | None:
+    current_time = utils.get_timestamp_float()
 
-
-async def _db_session_worker(
-    bot: Bot,
-    db_session: db.DBSession,
-    rezka_cache_data: AsyncTimedRezkaCacheData
-) -> None:
+    # NOTE: rows locked by another worker's claim are skipped instead of waited for, and the lock is
+    #       only held until the lease is committed, so queueing users never block on a running download
     db_download_item_queue = (await db_session.execute(
         sa.select(db.DownloadItemQueue)
+        .where(
+            sa.or_(
+                db.DownloadItemQueue.leased_until.is_(None),
+                db.DownloadItemQueue.leased_until < current_time
+            )
+        )
+        .order_by(db.DownloadItemQueue.id.asc())
         .limit(1)
+        .with_for_update(skip_locked=True)
     )).scalars().first()
 
     if db_download_item_queue is None:
+        return None
+
+    db_download_item_queue.leased_until = current_time + DOWNLOAD_LEASE_TIME
+    db_download_item_queue.lease_owner = worker_id
+    db_download_item_queue.attempts += 1
+
+    await db_session.commit()
+
+    return db_download_item_queue
+
+
+async def _renew_download_item_queue_lease(
+    db_sessionmaker: db.DBSessionMaker,
+    db_download_item_queue_id: int,
+    worker_id: str,
+    logger: utils.Logger
+) -> None:
+    leased_until = utils.get_timestamp_float() + DOWNLOAD_LEASE_TIME
+
+    while True:
+        await asyncio.sleep(DOWNLOAD_LEASE_RENEW_DELAY)
+
+        new_leased_until = utils.get_timestamp_float() + DOWNLOAD_LEASE_TIME
+
+        try:
+            async with db_sessionmaker() as db_session:
+                renewed_id = (await db_session.execute(
+                    sa.update(db.DownloadItemQueue)
+                    .where(
+                        db.DownloadItemQueue.id == db_download_item_queue_id,
+                        db.DownloadItemQueue.lease_owner == worker_id
+                    )
+                    .values(
+                        leased_until = new_leased_until
+                    )
+                    .returning(db.DownloadItemQueue.id)
+                )).scalar_one_or_none()
+
+                await db_session.commit()
+
+        except (SQLAlchemyError, OSError) as ex:
+            logger.exception(ex)
+
+            if utils.get_timestamp_float() + DOWNLOAD_LEASE_RENEW_DELAY < leased_until:
+                continue
+
+            return
+
+        if renewed_id is None:
+            return
+
+        leased_until = new_leased_until
+
+
+def _remove_download_files(db_download_item_queue: db.DownloadItemQueue) -> None:
+    file_name_prefix = FILE_NAME_CONSTUCTOR.format(
+        models.CachedRezkaData.get_key(
+            item_id = db_download_item_queue.item_id,
+            translator_id = db_download_item_queue.translator_id,
+            season_id = db_download_item_queue.season_id,
+            episode_id = db_download_item_queue.episode_id
+        ),
+        ""
+    ).removesuffix(FILE_NAME_SUFFIX)
+
+    # NOTE: qualities never contain "_", unlike the keys of this item's other episodes sharing the prefix
+    for path in config.downloads_temp_dirpath.glob(file_name_prefix + "*"):
+        if "_" not in path.name.removeprefix(file_name_prefix):
+            path.unlink(
+                missing_ok = True
+            )
+
+
+async def _drop_download_item_queue(bot: Bot, db_session: db.DBSession, db_download_item_queue: db.DownloadItemQueue) -> None:
+    await db_session.delete(db_download_item_queue)
+    await db_session.commit()
+
+    _remove_download_files(db_download_item_queue)
+
+    await _edit_users_message(
+        bot = bot,
+        db_download_item_queue = db_download_item_queue,
+        text = TEXTS.not_avaliable.default
+    )
+
+
+async def _fail_download_item_queue(bot: Bot, db_session: db.DBSession, db_download_item_queue: db.DownloadItemQueue, worker_id: str) -> None:
+    await db_session.rollback()
+    await db_session.refresh(db_download_item_queue)
+
+    if db_download_item_queue.lease_owner != worker_id or db_download_item_queue.attempts < DOWNLOAD_MAX_ATTEMPTS:
         return
 
+    await _drop_download_item_queue(
+        bot = bot,
+        db_session = db_session,
+        db_download_item_queue = db_download_item_queue
+    )
+
+
+async def _db_session_worker(
+    bot: Bot,
+    db_session: db.DBSession,
+    rezka_cache_data: AsyncTimedRezkaCacheData,
+    content_lengths_cache: AsyncTimedContentLengthsCache,
+    db_download_item_queue: db.DownloadItemQueue
+) -> None:
     cache_rezka_data_key = models.CachedRezkaData.get_key(
         item_id = db_download_item_queue.item_id,
         translator_id = db_download_item_queue.translator_id,
@@ -138,34 +226,22 @@ async def _db_session_worker(
         episode_id = db_download_item_queue.episode_id
     )
 
-    selected_quality: str | None = None
-    selected_direct_url: str | None = None
-
     if not got_cached_rezka_data.urls:
-        await db_session.delete(db_download_item_queue)
-
-        await _edit_users_message(
+        await _drop_download_item_queue(
             bot = bot,
-            db_download_item_queue = db_download_item_queue,
-            text = TEXTS.not_avaliable.default
+            db_session = db_session,
+            db_download_item_queue = db_download_item_queue
         )
 
         return
 
-    for quality, direct_url in utils.sort_direct_urls(got_cached_rezka_data.urls).items():
-        if await determine_content_length_by_url(direct_url) < config.max_file_upload_size:
-            selected_quality = quality
-            selected_direct_url = direct_url
-
-            break
+    selected_quality, selected_direct_url = await _select_direct_url(content_lengths_cache, got_cached_rezka_data.urls)
 
     if not selected_quality or not selected_direct_url:
-        await db_session.delete(db_download_item_queue)
-
-        await _edit_users_message(
+        await _drop_download_item_queue(
             bot = bot,
-            db_download_item_queue = db_download_item_queue,
-            text = TEXTS.not_avaliable.default
+            db_session = db_session,
+            db_download_item_queue = db_download_item_queue
         )
 
         return
@@ -186,41 +262,57 @@ async def _db_session_worker(
 
     save_path = config.downloads_temp_dirpath / file_name
 
-    process = await asyncio.create_subprocess_exec(
-        "wget",
-        selected_direct_url,
-        "-O", save_path.resolve().as_posix(),
-        "--progress=dot:giga",
-        stdout = asyncio.subprocess.PIPE,
-        stderr = asyncio.subprocess.PIPE
-    )
+    mp4_info = MP4Info()
 
-    last_update_time = utils.get_timestamp_float()
+    with suppress(HTTPError, DownloadException):
+        mp4_info = await probe_mp4_url(
+            http_client = http_client,
+            url = selected_direct_url,
+            size = await determine_content_length_by_url(content_lengths_cache, selected_direct_url)
+        )
 
-    async for line in process.stderr:  # type: ignore
-        match = WGET_PROGRESS_PATTERN.search(line.decode())
+    downloaded_percentage = 0
 
-        if match:
-            progress = int(match.group(1))
+    def on_download_progress(downloaded_size: int, content_length: int) -> None:
+        nonlocal downloaded_percentage
 
-            if utils.get_timestamp_float() - last_update_time >= DOWNLOAD_EDIT_PROGRESS_DELAY:
-                await _edit_users_message(
-                    bot = bot,
-                    db_download_item_queue = db_download_item_queue,
-                    text = TEXTS.select.download_quality_statuses.downloading.format(
-                        quality = selected_quality,
-                        progress_percentage = progress
-                    )
+        if content_length:
+            downloaded_percentage = downloaded_size * 100 // content_length
+
+    async def report_download_progress() -> None:
+        reported_percentage = 0
+
+        while True:
+            await asyncio.sleep(DOWNLOAD_EDIT_PROGRESS_DELAY)
+
+            if downloaded_percentage == reported_percentage:
+                continue
+
+            reported_percentage = downloaded_percentage
+
+            await _edit_users_message(
+                bot = bot,
+                db_download_item_queue = db_download_item_queue,
+                text = TEXTS.select.download_quality_statuses.downloading.format(
+                    quality = selected_quality,
+                    progress_percentage = reported_percentage
                 )
+            )
 
-                last_update_time = utils.get_timestamp_float()
+    report_download_progress_task = asyncio.create_task(report_download_progress())
 
-    await process.wait()
+    try:
+        await downloader.download(
+            url = selected_direct_url,
+            path = save_path,
+            on_progress = on_download_progress
+        )
 
-    if process.returncode != 0:
-        stderr = await process.stderr.read()  # type: ignore
+    finally:
+        report_download_progress_task.cancel()
 
-        raise Exception(stderr.decode())
+        with suppress(asyncio.CancelledError):
+            await report_download_progress_task
 
     await _edit_users_message(
         bot = bot,
@@ -230,13 +322,16 @@ async def _db_session_worker(
         )
     )
 
-    width, height = determine_content_resolution_by_file_content(save_path)
+    if mp4_info.width is None:
+        mp4_info = await probe_mp4_file(save_path)
 
     bot_video_message = await bot.send_video(
         chat_id = config.download_items_queue_to_chat_id,
         video = f"file://{save_path.resolve()}",
-        width = width,
-        height = height,
+        width = mp4_info.width,
+        height = mp4_info.height,
+        duration = mp4_info.duration,
+        supports_streaming = mp4_info.faststart,
         caption = "{}\n{}\n{}{}".format(
             db_download_item_queue.item_title,
             db_download_item_queue.translator_title,
@@ -256,6 +351,8 @@ async def _db_session_worker(
 
     video_file_id = bot_video_message.video.file_id  # type: ignore
 
+    await db_session.refresh(db_download_item_queue)
+
     db_downloaded_item = db.DownloadedItem(
         item_id = db_download_item_queue.item_id,
         item_title = db_download_item_queue.item_title,
@@ -311,19 +408,76 @@ async def _db_session_worker(
 async def download_items_queue_worker(
     bot: Bot,
     db_sessionmaker: db.DBSessionMaker,
-    rezka_cache_data: AsyncTimedRezkaCacheData
+    rezka_cache_data: AsyncTimedRezkaCacheData,
+    content_lengths_cache: AsyncTimedContentLengthsCache,
+    logger: utils.Logger
 ) -> None:
-    if not config.downloads_temp_dirpath.exists():
-        config.downloads_temp_dirpath.mkdir()
+    rezka.set_request_priority(enums.RezkaRequestPriorityEnum.DOWNLOAD)
+
+    worker_id = uuid4().hex
+
+    config.downloads_temp_dirpath.mkdir(
+        parents = True,
+        exist_ok = True
+    )
 
     while True:
         async with db_sessionmaker() as db_session:
-            await _db_session_worker(
-                bot = bot,
-                db_session = db_session,
-                rezka_cache_data = rezka_cache_data
-            )
+            db_download_item_queue = await _claim_download_item_queue(db_session, worker_id)
+
+            if db_download_item_queue is not None:
+                if db_download_item_queue.attempts > DOWNLOAD_MAX_ATTEMPTS:
+                    await _drop_download_item_queue(
+                        bot = bot,
+                        db_session = db_session,
+                        db_download_item_queue = db_download_item_queue
+                    )
+
+                    continue
+
+                job_task = asyncio.create_task(_db_session_worker(
+                    bot = bot,
+                    db_session = db_session,
+                    rezka_cache_data = rezka_cache_data,
+                    content_lengths_cache = content_lengths_cache,
+                    db_download_item_queue = db_download_item_queue
+                ))
+
+                lease_task = asyncio.create_task(_renew_download_item_queue_lease(
+                    db_sessionmaker = db_sessionmaker,
+                    db_download_item_queue_id = db_download_item_queue.id,
+                    worker_id = worker_id,
+                    logger = logger
+                ))
+
+                try:
+                    await asyncio.wait((job_task, lease_task), return_when=asyncio.FIRST_COMPLETED)
+
+                finally:
+                    job_task.cancel()
+                    lease_task.cancel()
+
+                    await asyncio.gather(job_task, lease_task, return_exceptions=True)
+
+                try:
+                    if job_task.cancelled():
+                        raise DownloadException("Download lease was lost")
+
+                    job_task.result()
+
+                    await db_session.commit()
+
+                except Exception as ex:
+                    logger.exception(ex)
+
+                    with suppress(SQLAlchemyError, OSError):
+                        await _fail_download_item_queue(
+                            bot = bot,
+                            db_session = db_session,
+                            db_download_item_queue = db_download_item_queue,
+                            worker_id = worker_id
+                        )
 
-            await db_session.commit()
+                continue
 
         await asyncio.sleep(SLEEP_TIME)
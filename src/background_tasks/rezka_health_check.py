@@ -0,0 +1,11 @@
+import asyncio
+
+from src.rezka import ScheduledRezkaAPI
+from src.config import config
+
+
+async def rezka_upstreams_health_checker(rezka_api: ScheduledRezkaAPI) -> None:
+    while True:
+        await rezka_api.check_upstreams()
+
+        await asyncio.sleep(config.rezka_api_health_check_interval)
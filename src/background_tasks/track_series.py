@@ -6,14 +6,17 @@ import sqlalchemy as sa
 import asyncio
 import typing
 
-from src import db, utils
+from src import db, utils, enums, rezka
 from src.cache import AsyncTimedRezkaCacheData
+from src.rezka import RezkaAPIUnavailableException
 from src.basic_data import TEXTS
 from src.config import config
 
 
 FETCH_LIMIT = 100
 
+_warm_up_tasks: set[asyncio.Task[None]] = set()
+
 
 async def _get_track_series_by_cursor(session: db.DBSession, last_id: int | None = None) -> tuple[typing.Sequence[db.TrackSeries], bool]:
     query = sa.select(db.TrackSeries)
@@ -37,12 +40,28 @@ async def _get_track_series_by_cursor(session: db.DBSession, last_id: int | None
     return (results, has_next)
 
 
+async def _warm_up_new_episodes(rezka_cache_data: AsyncTimedRezkaCacheData, new_episodes: list[tuple[db.TrackSeries, str, list[str]]]) -> None:
+    for db_track_series, season_id, episode_ids in new_episodes:
+        async for _ in rezka_cache_data.iter_season(
+            item_id = db_track_series.item_id,
+            item_title = db_track_series.item_title,
+            translator_id = db_track_series.translator_id,
+            translator_title = db_track_series.translator_title,
+            translator_additional_arguments = db_track_series.translator_additional_arguments,
+            season_id = season_id,
+            episode_ids = episode_ids
+        ):
+            pass
+
+
 async def db_track_series_checker(
     bot: Bot,
     db_sessionmaker: db.DBSessionMaker,
     rezka_cache_data: AsyncTimedRezkaCacheData,
     logger: utils.Logger
 ) -> None:
+    rezka.set_request_priority(enums.RezkaRequestPriorityEnum.TRACKER)
+
     while True:
         await asyncio.sleep(config.track_series_checker_delay)
 
@@ -129,6 +148,7 @@ async def db_track_series_checker(
 
             while has_next:
                 notify_updates: list[tuple[str, list[str], list[int], list[int]]] = []
+                new_episodes: list[tuple[db.TrackSeries, str, list[str]]] = []
 
                 db_track_series_list, has_next = await _get_track_series_by_cursor(
                     session = db_session,
@@ -155,7 +175,7 @@ async def db_track_series_checker(
                         )
 
                     except RezkaAPIException as ex:
-                        if ex.description and "premium content" in ex.description.lower():
+                        if utils.is_premium_content_exception(ex) or isinstance(ex, RezkaAPIUnavailableException):
                             await asyncio.sleep(config.track_series_checker_per_delay)
 
                             continue
@@ -220,6 +240,8 @@ async def db_track_series_checker(
                                     )
                                 )
 
+                            new_episodes.append((db_track_series, last_season_id, raw_last_season_episodes_ids[last_episode_id_index + 1:]))
+
                             db_track_series.last_episode_id = raw_last_season_episodes_ids[-1]
 
                         if len(raw_seasons_data) - 1 > last_season_id_index:
@@ -254,6 +276,8 @@ async def db_track_series_checker(
                                         )
                                     )
 
+                                new_episodes.append((db_track_series, season_id, episodes_ids))
+
                                 db_track_series.last_season_id = season_id
                                 db_track_series.last_episode_id = episodes_ids[-1]
 
@@ -289,5 +313,11 @@ async def db_track_series_checker(
 
                         await asyncio.sleep(config.track_series_checker_per_message_delay)
 
+                if new_episodes:
+                    warm_up_task = asyncio.create_task(_warm_up_new_episodes(rezka_cache_data, new_episodes))
+
+                    _warm_up_tasks.add(warm_up_task)
+                    warm_up_task.add_done_callback(_warm_up_tasks.discard)
+
                 if db_track_series_list:
                     last_track_series_id = db_track_series_list[-1].id
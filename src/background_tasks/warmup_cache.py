@@ -0,0 +1,139 @@
+from time import perf_counter
+
+import sqlalchemy as sa
+import asyncio
+import typing
+
+from src import db, models, utils, enums, rezka
+from src.cache import AsyncTimedRezkaCacheData, AsyncTimedRezkaCacheShortInfo
+from src.config import config
+
+
+WARMUP_PROGRESS_LOG_STEP = 25
+
+
+class _WarmupItem(typing.NamedTuple):
+    item_id: str
+    item_title: str
+    translator_id: str
+    translator_title: str
+    translator_additional_arguments: dict[str, str]
+    is_film: bool
+    season_id: str | None = None
+    episode_id: str | None = None
+
+
+async def _get_warmup_items(db_sessionmaker: db.DBSessionMaker, limit: int) -> list[_WarmupItem]:
+    async with db_sessionmaker() as db_session:
+        db_track_series_list = (await db_session.execute(
+            sa.select(db.TrackSeries)
+            .order_by(
+                sa.func.cardinality(db.TrackSeries.user_tg_ids).desc(),
+                db.TrackSeries.id.asc()
+            )
+            .limit(limit)
+        )).scalars().all()
+
+        db_downloaded_items = (await db_session.execute(
+            sa.select(db.DownloadedItem)
+            .order_by(db.DownloadedItem.id.desc())
+            .limit(limit)
+        )).scalars().all()
+
+    warmup_items: dict[str, _WarmupItem] = {}
+
+    for db_track_series in db_track_series_list:
+        warmup_items.setdefault(
+            models.CachedRezkaData.get_key(
+                item_id = db_track_series.item_id,
+                translator_id = db_track_series.translator_id
+            ),
+            _WarmupItem(
+                item_id = db_track_series.item_id,
+                item_title = db_track_series.item_title,
+                translator_id = db_track_series.translator_id,
+                translator_title = db_track_series.translator_title,
+                translator_additional_arguments = db_track_series.translator_additional_arguments,
+                is_film = False
+            )
+        )
+
+    for db_downloaded_item in db_downloaded_items:
+        warmup_items.setdefault(
+            models.CachedRezkaData.get_key(
+                item_id = db_downloaded_item.item_id,
+                translator_id = db_downloaded_item.translator_id,
+                season_id = db_downloaded_item.season_id,
+                episode_id = db_downloaded_item.episode_id
+            ),
+            _WarmupItem(
+                item_id = db_downloaded_item.item_id,
+                item_title = db_downloaded_item.item_title,
+                translator_id = db_downloaded_item.translator_id,
+                translator_title = db_downloaded_item.translator_title,
+                translator_additional_arguments = db_downloaded_item.translator_additional_arguments,
+                is_film = db_downloaded_item.season_id is None,
+                season_id = db_downloaded_item.season_id,
+                episode_id = db_downloaded_item.episode_id
+            )
+        )
+
+    return list(warmup_items.values())
+
+
+async def warmup_rezka_caches(
+    db_sessionmaker: db.DBSessionMaker,
+    rezka_cache_data: AsyncTimedRezkaCacheData,
+    rezka_cache_short_info: AsyncTimedRezkaCacheShortInfo,
+    logger: utils.Logger
+) -> None:
+    rezka.set_request_priority(enums.RezkaRequestPriorityEnum.PREFETCH)
+
+    started_at = perf_counter()
+
+    for cache in (rezka_cache_data, rezka_cache_short_info):
+        loaded_count = await cache.load_from_storage(config.cache_warmup_limit)
+
+        if loaded_count:
+            logger.info(f"Cache warm-up: loaded {loaded_count} {type(cache).__name__} entries from storage")
+
+    warmup_items = [
+        warmup_item
+        for warmup_item in await _get_warmup_items(db_sessionmaker, config.cache_warmup_limit)
+        if rezka_cache_data.peek(models.CachedRezkaData.get_key(
+            item_id = warmup_item.item_id,
+            translator_id = warmup_item.translator_id,
+            season_id = warmup_item.season_id,
+            episode_id = warmup_item.episode_id
+        )) is None
+    ]
+
+    total_count = len(warmup_items)
+    done_count = 0
+    failed_count = 0
+
+    logger.info(f"Cache warm-up: fetching {total_count} items with concurrency {config.cache_warmup_concurrency}")
+
+    semaphore = asyncio.Semaphore(config.cache_warmup_concurrency)
+
+    async def warmup_one(warmup_item: _WarmupItem) -> None:
+        nonlocal done_count, failed_count
+
+        async with semaphore:
+            try:
+                await rezka_cache_data.get_or_set(**warmup_item._asdict())
+
+            except Exception:
+                failed_count += 1
+
+        done_count += 1
+
+        if done_count % WARMUP_PROGRESS_LOG_STEP == 0 and done_count < total_count:
+            logger.info(f"Cache warm-up: {done_count}/{total_count} items, {perf_counter() - started_at:.1f}s elapsed")
+
+    await asyncio.gather(*(
+        warmup_one(warmup_item)
+        for warmup_item in warmup_items
+    ))
+
+    logger.info(f"Cache warm-up: done, {total_count - failed_count}/{total_count} items fetched, {failed_count} failed, in {perf_counter() - started_at:.1f}s")
@@ -18,6 +18,10 @@ class TEXTS:
             "Код ошибки: {error_id}"
         )
 
+        class rezka_unavailable:
+            message = "⏳ Источник сейчас недоступен, попробуйте чуть позже"
+            callback_query = "⏳ Источник сейчас недоступен, попробуйте чуть позже"
+
     start = (
         "👋 Привет!\n"
         "Чтобы посмотреть фильм/сериал просто пришли мне ссылку на него с помощью встроенной кнопки ниже:"
@@ -133,6 +137,11 @@ class TEXTS:
             season_episodes = "— 🆕 Серия {episode_start_digit}-{episode_end_digit} (❇️ {season_digit} сезон)"
 
     updated = "☑️ Ссылки обновлены!"
+    updated_recently = "⏳ Ссылки недавно обновлялись, попробуйте немного позже"
+
+    class cache_invalidate:
+        usage = "Использование: <code>/cache_invalidate item_id [translator_id]</code>"
+        done = "🗑 Удалено записей из кэша: {removed_count}"
 
     class not_avaliable:
         default = "Фильм/сериал в настоящее время недоступен!"
@@ -0,0 +1,29 @@
+from .base import AsyncTimedCache
+from .eviction import WTinyLFUPolicy
+from .storage import BaseCacheStorage, DBCacheStorage, StoredCacheEntry
+from .bus import CacheBus
+from .stats import CacheStats, LatencyHistogram
+from .content_lengths import AsyncTimedContentLengthsCache
+from .rezka import (
+    BaseTimedRezkaCache,
+    AsyncTimedRezkaCacheData,
+    AsyncTimedRezkaCacheShortInfo,
+    AsyncTimedRezkaCacheSearch,
+)
+
+
+__all__ = (
+    "AsyncTimedCache",
+    "WTinyLFUPolicy",
+    "BaseCacheStorage",
+    "DBCacheStorage",
+    "StoredCacheEntry",
+    "CacheBus",
+    "CacheStats",
+    "LatencyHistogram",
+    "AsyncTimedContentLengthsCache",
+    "BaseTimedRezkaCache",
+    "AsyncTimedRezkaCacheData",
+    "AsyncTimedRezkaCacheShortInfo",
+    "AsyncTimedRezkaCacheSearch",
+)
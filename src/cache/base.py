@@ -0,0 +1,423 @@
+from dataclasses import dataclass
+
+import asyncio
+import heapq
+import itertools
+import typing
+
+from src import utils
+from .eviction import WTinyLFUPolicy
+from .storage import BaseCacheStorage, StoredCacheEntry
+from .stats import CacheStats
+
+if typing.TYPE_CHECKING:
+    from .bus import CacheBus
+
+
+K = typing.TypeVar("K")
+V = typing.TypeVar("V")
+
+
+EXPIRY_HEAP_COMPACT_RATIO = 2
+EXPIRY_HEAP_COMPACT_MIN_SIZE = 1024
+CLEAN_EXPIRED_BATCH_SIZE = 1000
+
+
+@dataclass(slots=True)
+class CacheEntry(typing.Generic[V]):
+    value: V
+    created_at: float
+    expires_at: float
+
+
+class AsyncTimedCache(typing.Generic[K, V]):
+    def __init__(
+        self,
+        expiration_time: int,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        get_size: typing.Callable[[V], int] = utils.get_object_size,
+        storage: BaseCacheStorage | None = None,
+        storage_namespace: str | None = None,
+        stale_time: int | None = None,
+        stale_if_error_time: int | None = None
+    ) -> None:
+        if stale_time is not None and stale_time >= expiration_time:
+            raise ValueError(f"stale_time ({stale_time}) must be less than expiration_time ({expiration_time})")
+
+        self._cache: dict[K, CacheEntry[V]] = {}
+        self._expiration_time = expiration_time
+        self._stale_time = stale_time
+        self._stale_if_error_time = stale_if_error_time or 0
+        self._get_size = get_size
+        self._storage = storage
+        self._storage_namespace = storage_namespace or type(self).__name__
+        self._bus: "CacheBus | None" = None
+
+        self.stats = CacheStats()
+
+        self._expiry_heap: list[tuple[float, int, K]] = []
+        self._expiry_sequence = itertools.count()
+
+        self._eviction_policy: WTinyLFUPolicy[K] | None = (
+            WTinyLFUPolicy(
+                max_entries = max_entries,
+                max_bytes = max_bytes
+            )
+            if max_entries or max_bytes
+            else
+            None
+        )
+
+    @property
+    def size(self) -> int:
+        return len(self._cache)
+
+    @property
+    def size_bytes(self) -> int | None:
+        if self._eviction_policy is None:
+            return None
+
+        return self._eviction_policy.total_bytes
+
+    @property
+    def storage_namespace(self) -> str:
+        return self._storage_namespace
+
+    def attach_bus(self, bus: "CacheBus") -> None:
+        self._bus = bus
+
+    def _publish(self, event: str, **data: typing.Any) -> None:
+        if self._bus is not None:
+            self._bus.publish(self._storage_namespace, event, data)
+
+    def handle_bus_event(self, event: str, data: dict[str, typing.Any]) -> None:
+        if event == "set":
+            self._adopt_entry(
+                key = data["key"],
+                raw_value = data.get("value"),
+                cached_at = data["cached_at"],
+                expires_at = data["expires_at"]
+            )
+
+        elif event == "remove":
+            self._remove(data["key"])
+
+        elif event == "remove_prefix":
+            self._remove_by_prefix(data["key_prefix"])
+
+    def _adopt_entry(self, key: K, raw_value: typing.Any, cached_at: float, expires_at: float) -> None:
+        entry = self._cache.get(key)
+
+        if entry is not None and entry.created_at >= cached_at:
+            return
+
+        if raw_value is None:
+            self._remove(key)
+
+            return
+
+        self._set_entry(
+            key = key,
+            value = self._load_value(raw_value),
+            created_at = cached_at,
+            expires_at = expires_at
+        )
+
+    def _dump_value(self, value: V) -> typing.Any:
+        raise NotImplementedError
+
+    def _load_value(self, raw_value: typing.Any) -> V:
+        raise NotImplementedError
+
+    async def _load_stored_value(self, key: K, raw_value: typing.Any) -> V | None:
+        try:
+            return self._load_value(raw_value)
+
+        except (KeyError, TypeError, ValueError):
+            if self._storage is not None:
+                await self._storage.remove(
+                    namespace = self._storage_namespace,
+                    key = str(key)
+                )
+
+            return None
+
+    def _on_entry_set(self, key: K, value: V) -> None:
+        pass
+
+    def _on_entry_removed(self, key: K, value: V) -> None:
+        pass
+
+    def _set_entry(self, key: K, value: V, created_at: float, expires_at: float) -> CacheEntry[V]:
+        previous_entry = self._cache.get(key)
+
+        if previous_entry is not None:
+            self._on_entry_removed(key, previous_entry.value)
+
+        entry = self._cache[key] = CacheEntry(
+            value = value,
+            created_at = created_at,
+            expires_at = expires_at
+        )
+
+        self._on_entry_set(key, value)
+
+        heapq.heappush(self._expiry_heap, (self._get_removal_time(entry), next(self._expiry_sequence), key))
+
+        if len(self._expiry_heap) > max(EXPIRY_HEAP_COMPACT_MIN_SIZE, len(self._cache) * EXPIRY_HEAP_COMPACT_RATIO):
+            self._compact_expiry_heap()
+
+        if self._eviction_policy is not None:
+            for evicted_key in self._eviction_policy.add(key, self._get_size(value)):
+                self._on_entry_removed(evicted_key, self._cache.pop(evicted_key).value)
+
+                self.stats.evictions += 1
+
+        return entry
+
+    def _get_removal_time(self, entry: CacheEntry[V]) -> float:
+        return entry.expires_at + self._stale_if_error_time
+
+    def _is_stale(self, entry: CacheEntry[V]) -> bool:
+        return self._stale_time is not None and utils.get_timestamp_float() - entry.created_at >= self._stale_time
+
+    def _get_value_expiration_time(self, value: V) -> float:
+        return self._expiration_time
+
+    async def set(self, key: K, value: V, expiration_time: float | None = None) -> None:
+        current_time = utils.get_timestamp_float()
+        expires_at = current_time + (
+            expiration_time
+            if expiration_time is not None
+            else
+            self._get_value_expiration_time(value)
+        )
+
+        self._set_entry(
+            key = key,
+            value = value,
+            created_at = current_time,
+            expires_at = expires_at
+        )
+
+        if self._storage is None and self._bus is None:
+            return
+
+        raw_value = self._dump_value(value)
+
+        self._publish(
+            "set",
+            key = key,
+            value = raw_value,
+            cached_at = current_time,
+            expires_at = expires_at
+        )
+
+        if self._storage is not None:
+            await self._storage.set(
+                namespace = self._storage_namespace,
+                key = str(key),
+                entry = StoredCacheEntry(
+                    value = raw_value,
+                    cached_at = current_time,
+                    expires_at = expires_at
+                )
+            )
+
+    def peek(self, key: K) -> V | None:
+        entry = self._cache.get(key)
+
+        if entry is None or utils.get_timestamp_float() >= entry.expires_at:
+            return None
+
+        return entry.value
+
+    async def get(self, key: K) -> V | None:
+        entry = await self._get_entry(key)
+
+        if entry is None:
+            return None
+
+        return entry.value
+
+    async def _get_entry(self, key: K) -> CacheEntry[V] | None:
+        entry = self._cache.get(key)
+
+        if entry is not None:
+            current_time = utils.get_timestamp_float()
+
+            if current_time < entry.expires_at:
+                if self._eviction_policy is not None:
+                    self._eviction_policy.record_access(key)
+
+                self.stats.hits += 1
+
+                return entry
+
+            if current_time >= self._get_removal_time(entry):
+                self._remove(key)
+
+                self.stats.expirations += 1
+
+        if self._eviction_policy is not None:
+            self._eviction_policy.record_miss(key)
+
+        if self._storage is not None:
+            stored_entry = await self._storage.get(
+                namespace = self._storage_namespace,
+                key = str(key)
+            )
+
+            if stored_entry is not None:
+                stored_value = await self._load_stored_value(key, stored_entry.value)
+
+                if stored_value is not None:
+                    self.stats.storage_hits += 1
+
+                    return self._set_entry(
+                        key = key,
+                        value = stored_value,
+                        created_at = stored_entry.cached_at,
+                        expires_at = stored_entry.expires_at
+                    )
+
+        self.stats.misses += 1
+
+        return None
+
+    def _get_stale_if_error_entry(self, key: K) -> CacheEntry[V] | None:
+        entry = self._cache.get(key)
+
+        if entry is None or utils.get_timestamp_float() >= self._get_removal_time(entry):
+            return None
+
+        return entry
+
+    def _remove(self, key: K) -> bool:
+        entry = self._cache.pop(key, None)
+
+        if entry is None:
+            return False
+
+        if self._eviction_policy is not None:
+            self._eviction_policy.remove(key)
+
+        self._on_entry_removed(key, entry.value)
+
+        return True
+
+    async def remove(self, key: K) -> bool:
+        removed = self._remove(key)
+
+        self._publish(
+            "remove",
+            key = key
+        )
+
+        if self._storage is not None:
+            await self._storage.remove(
+                namespace = self._storage_namespace,
+                key = str(key)
+            )
+
+        return removed
+
+    def _remove_by_prefix(self, key_prefix: str) -> int:
+        removed_count = 0
+
+        for key in [
+            key
+            for key in self._cache
+            if str(key).startswith(key_prefix)
+        ]:
+            removed_count += self._remove(key)
+
+        return removed_count
+
+    async def remove_by_prefix(self, key_prefix: str) -> int:
+        removed_count = self._remove_by_prefix(key_prefix)
+
+        self._publish(
+            "remove_prefix",
+            key_prefix = key_prefix
+        )
+
+        if self._storage is not None:
+            await self._storage.remove_by_prefix(
+                namespace = self._storage_namespace,
+                key_prefix = key_prefix
+            )
+
+        return removed_count
+
+    def _compact_expiry_heap(self) -> None:
+        self._expiry_heap = [
+            (self._get_removal_time(entry), next(self._expiry_sequence), key)
+            for key, entry in self._cache.items()
+        ]
+
+        heapq.heapify(self._expiry_heap)
+
+    async def clean_expired(self) -> None:
+        current_time = utils.get_timestamp_float()
+        popped_count = 0
+
+        while self._expiry_heap and self._expiry_heap[0][0] <= current_time:
+            removal_time, _, key = heapq.heappop(self._expiry_heap)
+
+            popped_count += 1
+
+            if popped_count % CLEAN_EXPIRED_BATCH_SIZE == 0:
+                await asyncio.sleep(0)
+
+            entry = self._cache.get(key)
+
+            if entry is not None and self._get_removal_time(entry) == removal_time:
+                self._remove(key)
+
+                self.stats.expirations += 1
+
+    async def load_from_storage(self, limit: int) -> int:
+        if self._storage is None:
+            return 0
+
+        stored_entries = await self._storage.get_recent(
+            namespace = self._storage_namespace,
+            limit = limit
+        )
+
+        loaded_count = 0
+
+        for raw_key, stored_entry in reversed(stored_entries):
+            key = typing.cast(K, raw_key)
+
+            if key in self._cache:
+                continue
+
+            stored_value = await self._load_stored_value(key, stored_entry.value)
+
+            if stored_value is None:
+                continue
+
+            self._set_entry(
+                key = key,
+                value = stored_value,
+                created_at = stored_entry.cached_at,
+                expires_at = stored_entry.expires_at
+            )
+
+            loaded_count += 1
+
+        return loaded_count
+
+    def get_stats_snapshot(self) -> dict[str, typing.Any]:
+        return dict(
+            size = self.size,
+            size_bytes = self.size_bytes,
+            **self.stats.snapshot()
+        )
+
+    async def clean_expired_storage(self) -> None:
+        if self._storage is not None:
+            await self._storage.clean_expired(self._storage_namespace)
@@ -0,0 +1,128 @@
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.exc import SQLAlchemyError
+from psycopg import sql, Error as PsycopgError
+from functools import partial
+from uuid import uuid4
+
+import simplejson as json
+import sqlalchemy as sa
+import asyncio
+import typing
+
+from src import utils
+
+
+CACHE_BUS_CHANNEL = "cache_events"
+# NOTE: Postgres rejects NOTIFY payloads of 8000 bytes and more
+NOTIFY_PAYLOAD_MAX_SIZE = 7900
+PUBLISH_QUEUE_MAX_SIZE = 10_000
+PUBLISH_BATCH_SIZE = 100
+RECONNECT_DELAY = 5.
+
+
+class CacheBusSubscriber(typing.Protocol):
+    @property
+    def storage_namespace(self) -> str:
+        ...
+
+    def attach_bus(self, bus: "CacheBus") -> None:
+        ...
+
+    def handle_bus_event(self, event: str, data: dict[str, typing.Any]) -> None:
+        ...
+
+
+class CacheBus:
+    def __init__(self, db_engine: AsyncEngine, channel: str = CACHE_BUS_CHANNEL) -> None:
+        self._db_engine = db_engine
+        self._channel = channel
+        # NOTE: NOTIFY is delivered to the sending session too, so own messages are told apart by this id
+        self._instance_id = uuid4().hex
+        self._subscribers: dict[str, CacheBusSubscriber] = {}
+        self._publish_queue: asyncio.Queue[str] = asyncio.Queue(PUBLISH_QUEUE_MAX_SIZE)
+
+    def register(self, cache: CacheBusSubscriber) -> None:
+        self._subscribers[cache.storage_namespace] = cache
+
+        cache.attach_bus(self)
+
+    def publish(self, namespace: str, event: str, data: dict[str, typing.Any]) -> None:
+        payload = self._get_payload(namespace, event, data)
+
+        if len(payload.encode()) > NOTIFY_PAYLOAD_MAX_SIZE and "value" in data:
+            payload = self._get_payload(namespace, event, {
+                key: value
+                for key, value in data.items()
+                if key != "value"
+            })
+
+        if not self._publish_queue.full():
+            self._publish_queue.put_nowait(payload)
+
+    def _get_payload(self, namespace: str, event: str, data: dict[str, typing.Any]) -> str:
+        return json.dumps(dict(
+            instance_id = self._instance_id,
+            namespace = namespace,
+            event = event,
+            data = data
+        ))
+
+    def _handle_payload(self, payload: str) -> None:
+        message = json.loads(payload)
+
+        if message["instance_id"] == self._instance_id:
+            return
+
+        subscriber = self._subscribers.get(message["namespace"])
+
+        if subscriber is not None:
+            subscriber.handle_bus_event(message["event"], message["data"])
+
+    async def _send(self) -> None:
+        payloads = [await self._publish_queue.get()]
+
+        while len(payloads) < PUBLISH_BATCH_SIZE and not self._publish_queue.empty():
+            payloads.append(self._publish_queue.get_nowait())
+
+        async with self._db_engine.connect() as db_connection:
+            for payload in payloads:
+                await db_connection.execute(
+                    sa.select(sa.func.pg_notify(self._channel, payload))
+                )
+
+            await db_connection.commit()
+
+    async def _listen(self, logger: utils.Logger) -> None:
+        async with self._db_engine.connect() as db_connection:
+            raw_connection = await db_connection.get_raw_connection()
+
+            raw_connection.detach()
+
+            driver_connection = raw_connection.driver_connection
+
+            # NOTE: outside autocommit notifications are only delivered between transactions
+            await driver_connection.set_autocommit(True)  # type: ignore
+            await driver_connection.execute(sql.SQL("LISTEN {}").format(sql.Identifier(self._channel)))  # type: ignore
+
+            async for notify in driver_connection.notifies():  # type: ignore
+                try:
+                    self._handle_payload(notify.payload)
+
+                except Exception as ex:
+                    logger.exception(f"Skipping malformed cache bus message: {ex!r}")
+
+    async def _run_forever(self, run: typing.Callable[[], typing.Awaitable[None]], logger: utils.Logger) -> None:
+        while True:
+            try:
+                await run()
+
+            except (SQLAlchemyError, PsycopgError, OSError) as ex:
+                logger.warning(f"Cache bus connection error: {ex!r}")
+
+                await asyncio.sleep(RECONNECT_DELAY)
+
+    async def run(self, logger: utils.Logger) -> None:
+        await asyncio.gather(
+            self._run_forever(partial(self._listen, logger), logger),
+            self._run_forever(self._send, logger)
+        )
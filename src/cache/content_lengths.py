@@ -0,0 +1,11 @@
+import typing
+
+from .base import AsyncTimedCache
+
+
+class AsyncTimedContentLengthsCache(AsyncTimedCache[str, int]):
+    def _dump_value(self, value: int) -> typing.Any:
+        return value
+
+    def _load_value(self, raw_value: typing.Any) -> int:
+        return int(raw_value)
@@ -0,0 +1,218 @@
+from collections import OrderedDict
+
+import math
+import typing
+
+
+K = typing.TypeVar("K")
+
+
+SKETCH_DEPTH = 4
+SKETCH_MAX_COUNTER = 15
+SKETCH_SAMPLE_SIZE_MULTIPLIER = 10
+SKETCH_MIN_WIDTH = 64
+DEFAULT_SKETCH_EXPECTED_ENTRIES = 1024
+
+WINDOW_RATIO = 0.01
+PROTECTED_RATIO = 0.8
+
+
+class FrequencySketch(typing.Generic[K]):
+    def __init__(self, expected_entries: int) -> None:
+        width = SKETCH_MIN_WIDTH
+
+        while width < expected_entries:
+            width <<= 1
+
+        self._mask = width - 1
+        self._rows = [bytearray(width) for _ in range(SKETCH_DEPTH)]
+        self._sample_size = width * SKETCH_SAMPLE_SIZE_MULTIPLIER
+        self._additions = 0
+
+    def _indexes(self, key: K) -> list[int]:
+        return [
+            hash((seed, key)) & self._mask
+            for seed in range(SKETCH_DEPTH)
+        ]
+
+    def frequency(self, key: K) -> int:
+        return min(
+            row[index]
+            for row, index in zip(self._rows, self._indexes(key))
+        )
+
+    def increment(self, key: K) -> None:
+        added = False
+
+        for row, index in zip(self._rows, self._indexes(key)):
+            if row[index] < SKETCH_MAX_COUNTER:
+                row[index] += 1
+                added = True
+
+        if added:
+            self._additions += 1
+
+            if self._additions >= self._sample_size:
+                self._reset()
+
+    def _reset(self) -> None:
+        self._rows = [
+            bytearray(counter >> 1 for counter in row)
+            for row in self._rows
+        ]
+
+        self._additions //= 2
+
+
+class _Segment(typing.Generic[K]):
+    def __init__(self, max_entries: float, max_bytes: float) -> None:
+        self.entries: OrderedDict[K, int] = OrderedDict()
+        self.bytes = 0
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def __contains__(self, key: K) -> bool:
+        return key in self.entries
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def push(self, key: K, size: int) -> None:
+        self.entries[key] = size
+        self.bytes += size
+
+    def pop(self, key: K) -> int:
+        size = self.entries.pop(key)
+        self.bytes -= size
+
+        return size
+
+    def pop_lru(self) -> tuple[K, int]:
+        key, size = self.entries.popitem(last=False)
+        self.bytes -= size
+
+        return (key, size)
+
+    def first_key(self) -> K | None:
+        return next(iter(self.entries), None)
+
+    def is_over_budget(self) -> bool:
+        return len(self.entries) > self.max_entries or self.bytes > self.max_bytes
+
+
+class WTinyLFUPolicy(typing.Generic[K]):
+    def __init__(self, max_entries: int | None = None, max_bytes: int | None = None) -> None:
+        for name, limit in (("max_entries", max_entries), ("max_bytes", max_bytes)):
+            if limit is not None and (not math.isfinite(limit) or limit <= 0):
+                raise ValueError(f"{name} must be a positive finite number or None, got {limit!r}")
+
+        self.max_entries: float = max_entries or float("inf")
+        self.max_bytes: float = max_bytes or float("inf")
+
+        self._sketch = FrequencySketch[K](max_entries or DEFAULT_SKETCH_EXPECTED_ENTRIES)
+
+        window_max_entries = max(1., self.max_entries * WINDOW_RATIO)
+        window_max_bytes = self.max_bytes * WINDOW_RATIO
+
+        self._window = _Segment[K](window_max_entries, window_max_bytes)
+        self._probation = _Segment[K](float("inf"), float("inf"))
+        self._protected = _Segment[K](
+            (self.max_entries - window_max_entries) * PROTECTED_RATIO,
+            (self.max_bytes - window_max_bytes) * PROTECTED_RATIO
+        )
+
+    def __len__(self) -> int:
+        return len(self._window) + len(self._probation) + len(self._protected)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._window.bytes + self._probation.bytes + self._protected.bytes
+
+    def _segment_of(self, key: K) -> _Segment[K] | None:
+        for segment in (self._window, self._probation, self._protected):
+            if key in segment:
+                return segment
+
+        return None
+
+    def record_miss(self, key: K) -> None:
+        self._sketch.increment(key)
+
+    def record_access(self, key: K) -> None:
+        self._sketch.increment(key)
+
+        segment = self._segment_of(key)
+
+        if segment is None:
+            return
+
+        if segment is self._probation:
+            self._protected.push(key, self._probation.pop(key))
+
+            while self._protected.is_over_budget() and len(self._protected) > 1:
+                self._probation.push(*self._protected.pop_lru())
+
+        else:
+            segment.entries.move_to_end(key)
+
+    def add(self, key: K, size: int) -> list[K]:
+        segment = self._segment_of(key)
+
+        if segment is not None:
+            segment.pop(key)
+            segment.push(key, size)
+
+        else:
+            self._sketch.increment(key)
+            self._window.push(key, size)
+
+        return self._evict()
+
+    def remove(self, key: K) -> None:
+        segment = self._segment_of(key)
+
+        if segment is not None:
+            segment.pop(key)
+
+    def _is_over_budget(self) -> bool:
+        return len(self) > self.max_entries or self.total_bytes > self.max_bytes
+
+    def _evict(self) -> list[K]:
+        candidates: list[K] = []
+
+        while self._window.is_over_budget() and len(self._window) > 1:
+            key, size = self._window.pop_lru()
+            self._probation.push(key, size)
+            candidates.append(key)
+
+        evicted: list[K] = []
+
+        while self._is_over_budget():
+            victim: K | None = None
+            victim_segment: _Segment[K] | None = None
+
+            for segment in (self._probation, self._protected, self._window):
+                victim = segment.first_key()
+
+                if victim is not None:
+                    victim_segment = segment
+
+                    break
+
+            if victim is None or victim_segment is None:
+                break
+
+            candidate = candidates.pop(0) if candidates else None
+
+            if candidate is not None and candidate != victim and candidate in self._probation:
+                if self._sketch.frequency(candidate) <= self._sketch.frequency(victim):
+                    victim = candidate
+                    victim_segment = self._probation
+
+                else:
+                    candidates.insert(0, candidate)
+
+            victim_segment.pop(victim)
+            evicted.append(victim)
+
+        return evicted
@@ -0,0 +1,557 @@
+from aiogram import types
+from cachetools import TTLCache
+from time import perf_counter
+from contextlib import suppress
+from rezka_api_sdk import RezkaAPI, RezkaAPIException, models as rezka_models
+
+import asyncio
+import typing
+
+from src import models, utils, enums, rezka
+from src.rezka.exceptions import RezkaAPIUnavailableException
+from .base import AsyncTimedCache, CacheEntry, K, V
+from .storage import BaseCacheStorage
+
+
+DIRECT_URLS_EXPIRATION_MARGIN = 60.
+SEARCH_PREFIX_MIN_LENGTH = 3
+FORCE_REFRESH_MAX_KEYS = 10_000
+SEASON_FETCH_CONCURRENCY = 4
+
+
+class BaseTimedRezkaCache(AsyncTimedCache[K, V]):
+    def __init__(
+        self,
+        rezka_api: RezkaAPI,
+        expiration_time: int,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+        storage: BaseCacheStorage | None = None,
+        storage_namespace: str | None = None,
+        stale_time: int | None = None,
+        negative_expiration_time: int | None = None,
+        premium_expiration_time: int | None = None,
+        force_refresh_interval: int | None = None,
+        stale_if_error_time: int | None = None
+    ) -> None:
+        super().__init__(
+            expiration_time = expiration_time,
+            max_entries = max_entries,
+            max_bytes = max_bytes,
+            storage = storage,
+            storage_namespace = storage_namespace,
+            stale_time = stale_time,
+            stale_if_error_time = stale_if_error_time
+        )
+
+        self._rezka_api = rezka_api
+        self._inflight: dict[K, asyncio.Task[V]] = {}
+        self._inflight_priority_handles: dict[K, rezka.RequestPriorityHandle] = {}
+
+        self._negative_expiration_time = negative_expiration_time
+        self._premium_cache: AsyncTimedCache[K, RezkaAPIException] | None = (
+            AsyncTimedCache(
+                expiration_time = premium_expiration_time
+            )
+            if premium_expiration_time
+            else
+            None
+        )
+
+        self._force_refreshed_keys: TTLCache[K, None] | None = (
+            TTLCache[K, None](
+                maxsize = FORCE_REFRESH_MAX_KEYS,
+                ttl = force_refresh_interval
+            )
+            if force_refresh_interval
+            else
+            None
+        )
+
+    async def get_or_set(self, *args: typing.Any, **kwargs: typing.Any) -> V:
+        raise NotImplementedError
+
+    async def invalidate_key(self, key: K) -> bool:
+        if self._premium_cache is not None:
+            await self._premium_cache.remove(key)
+
+        return await self.remove(key)
+
+    def handle_bus_event(self, event: str, data: dict[str, typing.Any]) -> None:
+        super().handle_bus_event(event, data)
+
+        if self._premium_cache is None:
+            return
+
+        if event in ("set", "remove"):
+            self._premium_cache._remove(data["key"])
+
+        elif event == "remove_prefix":
+            self._premium_cache._remove_by_prefix(data["key_prefix"])
+
+    async def clean_expired(self) -> None:
+        await super().clean_expired()
+
+        if self._premium_cache is not None:
+            await self._premium_cache.clean_expired()
+
+    async def _fetch_and_set(self, key: K, fetch: typing.Callable[[], typing.Awaitable[V]], priority_handle: "rezka.RequestPriorityHandle") -> V:
+        rezka.set_request_priority_handle(priority_handle)
+
+        started_at = perf_counter()
+
+        try:
+            value = await fetch()
+
+        except RezkaAPIException as ex:
+            self.stats.fill_errors += 1
+
+            if self._premium_cache is not None and utils.is_premium_content_exception(ex):
+                await self._premium_cache.set(
+                    key = key,
+                    value = ex
+                )
+
+            raise
+
+        except Exception:
+            self.stats.fill_errors += 1
+
+            raise
+
+        self.stats.fills += 1
+        self.stats.fill_latency.observe(perf_counter() - started_at)
+
+        await self.set(
+            key = key,
+            value = value
+        )
+
+        return value
+
+    def _on_fetch_done(self, key: K, task: asyncio.Task[V]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+            del self._inflight_priority_handles[key]
+
+        # NOTE: marks the exception as retrieved when every waiter was cancelled
+        if not task.cancelled():
+            task.exception()
+
+    def _start_fetch(self, key: K, fetch: typing.Callable[[], typing.Awaitable[V]]) -> asyncio.Task[V]:
+        task = self._inflight.get(key)
+
+        if task is None:
+            priority_handle = rezka.RequestPriorityHandle(rezka.get_request_priority())
+
+            task = asyncio.create_task(self._fetch_and_set(key, fetch, priority_handle))
+            task.add_done_callback(lambda task_: self._on_fetch_done(key, task_))
+
+            self._inflight[key] = task
+            self._inflight_priority_handles[key] = priority_handle
+
+        return task
+
+    def can_force_refresh(self, key: K) -> bool:
+        return self._force_refreshed_keys is None or key not in self._force_refreshed_keys
+
+    def _acquire_force_refresh(self, key: K) -> bool:
+        if self._force_refreshed_keys is None:
+            return True
+
+        if key in self._force_refreshed_keys:
+            return False
+
+        self._force_refreshed_keys[key] = None
+
+        return True
+
+    async def _wait_fetch(self, key: K, fetch: typing.Callable[[], typing.Awaitable[V]]) -> V:
+        task = self._start_fetch(key, fetch)
+
+        self._inflight_priority_handles[key].raise_priority(rezka.get_request_priority())
+
+        try:
+            return await asyncio.shield(task)
+
+        except RezkaAPIUnavailableException:
+            entry = self._get_stale_if_error_entry(key)
+
+            if entry is None:
+                raise
+
+            self.stats.stale_if_error_hits += 1
+
+            return entry.value
+
+    async def _get_or_fetch(self, key: K, fetch: typing.Callable[[], typing.Awaitable[V]], force_refresh: bool = False) -> V:
+        if force_refresh and self._acquire_force_refresh(key):
+            if self._premium_cache is not None:
+                await self._premium_cache.remove(key)
+
+            return await self._wait_fetch(key, fetch)
+
+        entry = await self._get_entry(key)
+
+        if entry is not None:
+            if self._is_stale(entry):
+                self.stats.stale_hits += 1
+
+                self._start_fetch(key, fetch)
+
+            return entry.value
+
+        if self._premium_cache is not None:
+            premium_ex = await self._premium_cache.get(key)
+
+            if premium_ex is not None:
+                raise RezkaAPIException(
+                    status_code = premium_ex.status_code,
+                    description = premium_ex.description
+                )
+
+        return await self._wait_fetch(key, fetch)
+
+
+class AsyncTimedRezkaCacheData(BaseTimedRezkaCache[str, models.CachedRezkaData]):
+    def __init__(self, *args: typing.Any, prefetch_concurrency: int = 0, **kwargs: typing.Any) -> None:
+        super().__init__(*args, **kwargs)
+
+        self._prefetch_concurrency = prefetch_concurrency
+        self._prefetch_tasks: set[asyncio.Task[None]] = set()
+
+        self._item_keys: dict[str, dict[str, set[str]]] = {}
+
+    def _on_entry_set(self, key: str, value: models.CachedRezkaData) -> None:
+        self._item_keys.setdefault(value.item_id, {}).setdefault(value.translator_id, set()).add(key)
+
+    def _on_entry_removed(self, key: str, value: models.CachedRezkaData) -> None:
+        translators_keys = self._item_keys.get(value.item_id)
+
+        if translators_keys is None:
+            return
+
+        keys = translators_keys.get(value.translator_id)
+
+        if keys is None:
+            return
+
+        keys.discard(key)
+
+        if not keys:
+            del translators_keys[value.translator_id]
+
+            if not translators_keys:
+                del self._item_keys[value.item_id]
+
+    def _dump_value(self, value: models.CachedRezkaData) -> typing.Any:
+        return value.to_dict()
+
+    def _load_value(self, raw_value: typing.Any) -> models.CachedRezkaData:
+        return models.CachedRezkaData.from_dict(raw_value)
+
+    def _get_value_expiration_time(self, value: models.CachedRezkaData) -> float:
+        expiration_time: float = self._expiration_time
+
+        if value.is_empty and self._negative_expiration_time:
+            expiration_time = min(expiration_time, self._negative_expiration_time)
+
+        if value.urls_expires_at is not None:
+            expiration_time = min(
+                expiration_time,
+                value.urls_expires_at - utils.get_timestamp_float() - DIRECT_URLS_EXPIRATION_MARGIN
+            )
+
+        return max(expiration_time, 0.)
+
+    def _get_removal_time(self, entry: CacheEntry[models.CachedRezkaData]) -> float:
+        removal_time = super()._get_removal_time(entry)
+
+        if entry.value.urls_expires_at is not None:
+            removal_time = max(min(removal_time, entry.value.urls_expires_at - DIRECT_URLS_EXPIRATION_MARGIN), entry.expires_at)
+
+        return removal_time
+
+    async def get_or_set(
+        self,
+        item_id: str,
+        item_title: str,
+        translator_id: str,
+        translator_title: str,
+        translator_additional_arguments: dict[str, str],
+        is_film: bool,
+        season_id: str | None = None,
+        episode_id: str | None = None,
+        force_refresh: bool = False
+    ):
+        cache_rezka_data_key = models.CachedRezkaData.get_key(
+            item_id = item_id,
+            translator_id = translator_id,
+            season_id = season_id,
+            episode_id = episode_id
+        )
+
+        async def fetch() -> models.CachedRezkaData:
+            response = await self._rezka_api.get_direct_urls(
+                id = item_id,
+                is_film = is_film,
+                translator_id = translator_id,
+                translator_additional_arguments = translator_additional_arguments,
+                season_id = season_id,
+                episode_id = episode_id
+            )
+
+            return models.CachedRezkaData.from_response(
+                item_id = item_id,
+                item_title = item_title,
+                translator_id = translator_id,
+                translator_title = translator_title,
+                translator_additional_arguments = translator_additional_arguments,
+                is_film = is_film,
+                season_id = season_id,
+                episode_id = episode_id,
+                response = response,
+                urls_expires_at = utils.get_direct_urls_expiration_timestamp(response.urls)
+            )
+
+        return await self._get_or_fetch(cache_rezka_data_key, fetch, force_refresh)
+
+    @staticmethod
+    def _get_item_key_prefix(item_id: str, translator_id: str | None = None) -> str:
+        if translator_id is None:
+            return item_id
+
+        return models.CachedRezkaData.get_key(
+            item_id = item_id,
+            translator_id = translator_id
+        )
+
+    def _invalidate_item(self, item_id: str, translator_id: str | None = None) -> int:
+        translators_keys = self._item_keys.get(item_id, {})
+
+        keys = [
+            key
+            for translator_id_, keys_ in translators_keys.items()
+            if translator_id is None or translator_id_ == translator_id
+            for key in keys_
+        ]
+
+        removed_count = 0
+
+        for key in keys:
+            removed_count += self._remove(key)
+
+        if self._premium_cache is not None:
+            key_prefix = self._get_item_key_prefix(item_id, translator_id)
+
+            if translator_id is not None:
+                self._premium_cache._remove(key_prefix)
+
+            self._premium_cache._remove_by_prefix(key_prefix + "_")
+
+        return removed_count
+
+    async def invalidate_item(self, item_id: str, translator_id: str | None = None) -> int:
+        removed_count = self._invalidate_item(item_id, translator_id)
+
+        self._publish(
+            "invalidate_item",
+            item_id = item_id,
+            translator_id = translator_id
+        )
+
+        if self._storage is not None:
+            key_prefix = self._get_item_key_prefix(item_id, translator_id)
+
+            if translator_id is not None:
+                await self._storage.remove(
+                    namespace = self._storage_namespace,
+                    key = key_prefix
+                )
+
+            await self._storage.remove_by_prefix(
+                namespace = self._storage_namespace,
+                key_prefix = key_prefix + "_"
+            )
+
+        return removed_count
+
+    def handle_bus_event(self, event: str, data: dict[str, typing.Any]) -> None:
+        if event == "invalidate_item":
+            self._invalidate_item(data["item_id"], data["translator_id"])
+
+            return
+
+        super().handle_bus_event(event, data)
+
+    async def iter_season(
+        self,
+        item_id: str,
+        item_title: str,
+        translator_id: str,
+        translator_title: str,
+        translator_additional_arguments: dict[str, str],
+        season_id: str,
+        episode_ids: list[str] | None = None,
+        concurrency: int = SEASON_FETCH_CONCURRENCY
+    ) -> typing.AsyncIterator[tuple[str, models.CachedRezkaData | Exception]]:
+        if episode_ids is None:
+            got_cached_rezka_data = await self.get_or_set(
+                item_id = item_id,
+                item_title = item_title,
+                translator_id = translator_id,
+                translator_title = translator_title,
+                translator_additional_arguments = translator_additional_arguments,
+                is_film = False
+            )
+
+            episode_ids = list((got_cached_rezka_data.episodes or {}).get(season_id, {}).keys())
+
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch_episode(episode_id: str) -> models.CachedRezkaData:
+            async with semaphore:
+                return await self.get_or_set(
+                    item_id = item_id,
+                    item_title = item_title,
+                    translator_id = translator_id,
+                    translator_title = translator_title,
+                    translator_additional_arguments = translator_additional_arguments,
+                    is_film = False,
+                    season_id = season_id,
+                    episode_id = episode_id
+                )
+
+        tasks = [
+            asyncio.create_task(fetch_episode(episode_id))
+            for episode_id in episode_ids
+        ]
+
+        try:
+            for episode_id, task in zip(episode_ids, tasks):
+                try:
+                    yield (episode_id, await task)
+
+                except Exception as ex:
+                    yield (episode_id, ex)
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _prefetch(self, **kwargs: typing.Any) -> None:
+        rezka.set_request_priority(enums.RezkaRequestPriorityEnum.PREFETCH)
+
+        with suppress(Exception):
+            await self.get_or_set(**kwargs)
+
+    def prefetch(
+        self,
+        item_id: str,
+        item_title: str,
+        translator_id: str,
+        translator_title: str,
+        translator_additional_arguments: dict[str, str],
+        is_film: bool,
+        season_id: str | None = None,
+        episode_id: str | None = None
+    ) -> None:
+        if len(self._prefetch_tasks) >= self._prefetch_concurrency:
+            return
+
+        cache_rezka_data_key = models.CachedRezkaData.get_key(
+            item_id = item_id,
+            translator_id = translator_id,
+            season_id = season_id,
+            episode_id = episode_id
+        )
+
+        if cache_rezka_data_key in self._inflight or self.peek(cache_rezka_data_key) is not None:
+            return
+
+        task = asyncio.create_task(self._prefetch(
+            item_id = item_id,
+            item_title = item_title,
+            translator_id = translator_id,
+            translator_title = translator_title,
+            translator_additional_arguments = translator_additional_arguments,
+            is_film = is_film,
+            season_id = season_id,
+            episode_id = episode_id
+        ))
+
+        self._prefetch_tasks.add(task)
+        task.add_done_callback(self._prefetch_tasks.discard)
+
+
+class AsyncTimedRezkaCacheShortInfo(BaseTimedRezkaCache[str, tuple[rezka_models.ShortInfoModel, list[rezka_models.TranslatorInfoModel]]]):
+    def _dump_value(self, value: tuple[rezka_models.ShortInfoModel, list[rezka_models.TranslatorInfoModel]]) -> typing.Any:
+        short_info, translators = value
+
+        return dict(
+            short_info = short_info.model_dump(mode="json"),
+            translators = [
+                translator.model_dump(mode="json")
+                for translator in translators
+            ]
+        )
+
+    def _load_value(self, raw_value: typing.Any) -> tuple[rezka_models.ShortInfoModel, list[rezka_models.TranslatorInfoModel]]:
+        return (
+            rezka_models.ShortInfoModel.model_validate(raw_value["short_info"]),
+            [
+                rezka_models.TranslatorInfoModel.model_validate(raw_translator)
+                for raw_translator in raw_value["translators"]
+            ]
+        )
+
+    async def get_or_set(self, url: str):
+        cache_key = url.split("/")[-1]
+
+        return await self._get_or_fetch(
+            cache_key,
+            lambda: self._rezka_api.get_info_and_translators(url)
+        )
+
+
+class AsyncTimedRezkaCacheSearch(BaseTimedRezkaCache[str, list[types.InlineQueryResultArticle]]):
+    def _fetch(self, query: str) -> typing.Callable[[], typing.Awaitable[list[types.InlineQueryResultArticle]]]:
+        async def fetch() -> list[types.InlineQueryResultArticle]:
+            return utils.get_inline_search_results(await self._rezka_api.search(query))
+
+        return fetch
+
+    async def get_or_set(self, query: str):
+        return await self._get_or_fetch(
+            utils.normalize_search_query(query),
+            self._fetch(query)
+        )
+
+    def get_by_prefix(self, query: str) -> list[types.InlineQueryResultArticle] | None:
+        cache_key = utils.normalize_search_query(query)
+
+        if self.peek(cache_key) is not None:
+            return None
+
+        for prefix_length in range(len(cache_key) - 1, SEARCH_PREFIX_MIN_LENGTH - 1, -1):
+            superset = self.peek(cache_key[:prefix_length].rstrip())
+
+            if superset is None:
+                continue
+
+            results = [
+                result
+                for result in superset
+                if utils.is_search_title_match(result.title, cache_key)
+            ]
+
+            if not results:
+                return None
+
+            self._start_fetch(cache_key, self._fetch(query))
+
+            return results
+
+        return None
@@ -0,0 +1,67 @@
+import bisect
+import typing
+
+
+FILL_LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1., 2.5, 5., 10., 20.)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets: tuple[float, ...] = FILL_LATENCY_BUCKETS) -> None:
+        self._buckets = buckets
+        self._counts = [0] * (len(buckets) + 1)
+        self._sum = 0.
+        self._count = 0
+
+    def observe(self, value: float) -> None:
+        self._counts[bisect.bisect_left(self._buckets, value)] += 1
+        self._sum += value
+        self._count += 1
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return dict(
+            count = self._count,
+            sum = self._sum,
+            buckets = {
+                **{
+                    str(bucket): count
+                    for bucket, count in zip(self._buckets, self._counts)
+                },
+                "+Inf": self._counts[-1]
+            }
+        )
+
+
+class CacheStats:
+    def __init__(self) -> None:
+        self.hits = 0
+        self.stale_hits = 0
+        self.stale_if_error_hits = 0
+        self.storage_hits = 0
+        self.misses = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.fills = 0
+        self.fill_errors = 0
+        self.fill_latency = LatencyHistogram()
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        lookups = self.hits + self.storage_hits + self.misses
+
+        return dict(
+            hits = self.hits,
+            stale_hits = self.stale_hits,
+            stale_if_error_hits = self.stale_if_error_hits,
+            storage_hits = self.storage_hits,
+            misses = self.misses,
+            hit_ratio = (
+                (self.hits + self.storage_hits) / lookups
+                if lookups
+                else
+                None
+            ),
+            expirations = self.expirations,
+            evictions = self.evictions,
+            fills = self.fills,
+            fill_errors = self.fill_errors,
+            fill_latency = self.fill_latency.snapshot()
+        )
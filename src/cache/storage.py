@@ -0,0 +1,163 @@
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import SQLAlchemyError
+
+import sqlalchemy as sa
+import typing
+
+from src import db, utils
+
+
+class StoredCacheEntry(typing.NamedTuple):
+    value: typing.Any
+    cached_at: float
+    expires_at: float
+
+
+class BaseCacheStorage:
+    async def get(self, namespace: str, key: str) -> StoredCacheEntry | None:
+        raise NotImplementedError
+
+    async def set(self, namespace: str, key: str, entry: StoredCacheEntry) -> None:
+        raise NotImplementedError
+
+    async def remove(self, namespace: str, key: str) -> None:
+        raise NotImplementedError
+
+    async def remove_by_prefix(self, namespace: str, key_prefix: str) -> None:
+        raise NotImplementedError
+
+    async def clean_expired(self, namespace: str) -> None:
+        raise NotImplementedError
+
+    async def get_recent(self, namespace: str, limit: int) -> list[tuple[str, StoredCacheEntry]]:
+        raise NotImplementedError
+
+
+class DBCacheStorage(BaseCacheStorage):
+    def __init__(self, db_sessionmaker: db.DBSessionMaker) -> None:
+        self._db_sessionmaker = db_sessionmaker
+
+    async def get(self, namespace: str, key: str) -> StoredCacheEntry | None:
+        try:
+            async with self._db_sessionmaker() as db_session:
+                row = (await db_session.execute(
+                    sa.select(
+                        db.CacheEntry.value,
+                        db.CacheEntry.cached_at,
+                        db.CacheEntry.expires_at
+                    )
+                    .where(
+                        db.CacheEntry.namespace == namespace,
+                        db.CacheEntry.key == key,
+                        db.CacheEntry.expires_at > utils.get_timestamp_float()
+                    )
+                )).first()
+
+        except SQLAlchemyError:
+            return None
+
+        if row is None:
+            return None
+
+        return StoredCacheEntry(*row)
+
+    async def set(self, namespace: str, key: str, entry: StoredCacheEntry) -> None:
+        insert_stmt = pg_insert(db.CacheEntry).values(
+            namespace = namespace,
+            key = key,
+            value = entry.value,
+            cached_at = entry.cached_at,
+            expires_at = entry.expires_at
+        )
+
+        try:
+            async with self._db_sessionmaker() as db_session:
+                await db_session.execute(
+                    insert_stmt.on_conflict_do_update(
+                        index_elements = [db.CacheEntry.namespace, db.CacheEntry.key],
+                        set_ = dict(
+                            value = insert_stmt.excluded.value,
+                            cached_at = insert_stmt.excluded.cached_at,
+                            expires_at = insert_stmt.excluded.expires_at
+                        )
+                    )
+                )
+
+                await db_session.commit()
+
+        except SQLAlchemyError:
+            pass
+
+    async def remove(self, namespace: str, key: str) -> None:
+        try:
+            async with self._db_sessionmaker() as db_session:
+                await db_session.execute(
+                    sa.delete(db.CacheEntry)
+                    .where(
+                        db.CacheEntry.namespace == namespace,
+                        db.CacheEntry.key == key
+                    )
+                )
+
+                await db_session.commit()
+
+        except SQLAlchemyError:
+            pass
+
+    async def remove_by_prefix(self, namespace: str, key_prefix: str) -> None:
+        try:
+            async with self._db_sessionmaker() as db_session:
+                await db_session.execute(
+                    sa.delete(db.CacheEntry)
+                    .where(
+                        db.CacheEntry.namespace == namespace,
+                        db.CacheEntry.key.startswith(key_prefix, autoescape=True)
+                    )
+                )
+
+                await db_session.commit()
+
+        except SQLAlchemyError:
+            pass
+
+    async def clean_expired(self, namespace: str) -> None:
+        try:
+            async with self._db_sessionmaker() as db_session:
+                await db_session.execute(
+                    sa.delete(db.CacheEntry)
+                    .where(
+                        db.CacheEntry.namespace == namespace,
+                        db.CacheEntry.expires_at <= utils.get_timestamp_float()
+                    )
+                )
+
+                await db_session.commit()
+
+        except SQLAlchemyError:
+            pass
+
+    async def get_recent(self, namespace: str, limit: int) -> list[tuple[str, StoredCacheEntry]]:
+        try:
+            async with self._db_sessionmaker() as db_session:
+                rows = (await db_session.execute(
+                    sa.select(
+                        db.CacheEntry.key,
+                        db.CacheEntry.value,
+                        db.CacheEntry.cached_at,
+                        db.CacheEntry.expires_at
+                    )
+                    .where(
+                        db.CacheEntry.namespace == namespace,
+                        db.CacheEntry.expires_at > utils.get_timestamp_float()
+                    )
+                    .order_by(db.CacheEntry.cached_at.desc())
+                    .limit(limit)
+                )).all()
+
+        except SQLAlchemyError:
+            return []
+
+        return [
+            (key, StoredCacheEntry(value, cached_at, expires_at))
+            for key, value, cached_at, expires_at in rows
+        ]
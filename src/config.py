@@ -31,7 +31,18 @@ class Config(BaseModel):
     db_url: str
     users_messages_per_second: int
     rezka_api_url: str | None = Field(default=None)
+    rezka_api_urls: list[str] = Field(default_factory=list)
+    rezka_api_health_check_interval: float = Field(default=30.)
     rezka_api_key: str
+    rezka_api_max_concurrency: int = Field(default=8)
+    rezka_api_rate_limit: float | None = Field(default=None)
+    rezka_api_rate_burst: int = Field(default=10)
+    rezka_api_timeout_min: float = Field(default=3.)
+    rezka_api_timeout_max: float = Field(default=20.)
+    rezka_api_breaker_failures: int = Field(default=5)
+    rezka_api_breaker_reset_time: float = Field(default=30.)
+    rezka_api_hedge_percentile: float | None = Field(default=95.)
+    rezka_api_hedge_budget: float = Field(default=0.05)
     private_key_filename: str | None = Field(default=None)
     external_player_url: str | None = Field(default=None)
     proxied_view_url: str
@@ -46,9 +57,30 @@ class Config(BaseModel):
     track_series_checker_per_delay: float
     download_items_queue_per_message_delay: float
     download_items_queue_to_chat_id: int
+    download_items_queue_workers: int = Field(default=1)
+    download_items_queue_segments: int = Field(default=4)
+    download_items_queue_segment_retries: int = Field(default=3)
     inline_query_cache_time: int
     cache_rezka_data_time: int
     cache_rezka_short_info_time: int
+    cache_rezka_data_soft_time: int | None = Field(default=None)
+    cache_rezka_short_info_soft_time: int | None = Field(default=None)
+    cache_rezka_negative_time: int | None = Field(default=300)
+    cache_rezka_premium_time: int | None = Field(default=21600)
+    cache_rezka_stale_if_error_time: int | None = Field(default=3600)
+    cache_rezka_force_refresh_interval: int | None = Field(default=60)
+    cache_rezka_search_time: int = Field(default=600)
+    cache_rezka_search_max_entries: int | None = Field(default=10_000)
+    rezka_prefetch_concurrency: int = Field(default=2)
+    cache_rezka_data_max_entries: int | None = Field(default=100_000)
+    cache_rezka_data_max_bytes: int | None = Field(default=256 * 1024 * 1024)  # 256 MB
+    cache_rezka_short_info_max_entries: int | None = Field(default=50_000)
+    cache_rezka_short_info_max_bytes: int | None = Field(default=64 * 1024 * 1024)  # 64 MB
+    cache_persistent: bool = Field(default=False)
+    cache_bus: bool = Field(default=False)
+    cache_warmup: bool = Field(default=False)
+    cache_warmup_limit: int = Field(default=200)
+    cache_warmup_concurrency: int = Field(default=4)
 
 
 with CONFIG_FILEPATH.open("r", encoding="utf-8") as file:
@@ -1,4 +1,5 @@
 from pathlib import Path
+from datetime import timedelta, timezone
 
 import re
 
@@ -26,3 +27,14 @@ ENTITY_TYPE_TO_TEXT = {
 
 TRANSLATOR_TEXT_PATTERN = re.compile(r"Озвучка:\s*<i>(.*?)</i>")
 SERIES_DATA_PATTERN = re.compile(r"сезон\s*-\s*(\d+),\s*серия\s*-\s*(\d+)")
+SEARCH_WORD_PATTERN = re.compile(r"\w+")
+
+# NOTE: signed direct urls carry their deadline either as a unix timestamp query argument
+#       or as a `:YYYYMMDDHH:` path token; the token has no zone, so it's read as Moscow time,
+#       which can only make an entry expire early if the CDN actually writes UTC
+DIRECT_URL_EXPIRATION_QUERY_ARGUMENTS = ("expires", "exp", "e", "valid_until")
+DIRECT_URL_EXPIRATION_PATH_PATTERN = re.compile(r":(\d{10}):")
+DIRECT_URL_EXPIRATION_PATH_TIMEZONE = timezone(timedelta(hours=3))
+DIRECT_URL_EXPIRATION_MAX_HORIZON = 60 * 60 * 24 * 7  # 7 days
+
+CONTENT_LENGTHS_CACHE_MAX_ENTRIES = 10_000
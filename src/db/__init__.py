@@ -10,6 +10,7 @@ from .models import (
     Payment,
     DownloadItemQueue,
     DownloadedItem,
+    CacheEntry,
 )
 
 
@@ -26,5 +27,6 @@ __all__ = (
     "Subscription",
     "Payment",
     "DownloadItemQueue",
-    "DownloadedItem"
+    "DownloadedItem",
+    "CacheEntry"
 )
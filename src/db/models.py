@@ -1,7 +1,9 @@
 from sqlalchemy import (
     BigInteger,
     Integer,
+    Double,
     ForeignKey,
+    UniqueConstraint,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship, Mapped, mapped_column
@@ -68,6 +70,9 @@ class DownloadItemQueue(BaseModel):
     user_tg_ids: Mapped[list[int]] = mapped_column(ARRAY(BigInteger), nullable=False)
     user_tg_message_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
     user_tg_reply_message_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    leased_until: Mapped[float | None] = mapped_column(Double, index=True, nullable=True, default=None)
+    lease_owner: Mapped[str | None] = mapped_column(nullable=True, default=None)
+    attempts: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
 
 
 class DownloadedItem(BaseModel):
@@ -98,3 +103,17 @@ class TrackSeries(BaseModel):
     user_tg_message_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
     last_season_id: Mapped[str] = mapped_column(default=None, nullable=True)
     last_episode_id: Mapped[str] = mapped_column(default=None, nullable=True)
+
+
+class CacheEntry(BaseModel):
+    __tablename__ = "cache_entries"
+    __table_args__ = (
+        UniqueConstraint("namespace", "key"),
+    )
+
+    id: Mapped[idpk] = mapped_column(init=False)
+    namespace: Mapped[str] = mapped_column(nullable=False)
+    key: Mapped[str] = mapped_column(nullable=False)
+    value: Mapped[typing.Any] = mapped_column(JSONB, nullable=False)
+    cached_at: Mapped[float] = mapped_column(Double, nullable=False)
+    expires_at: Mapped[float] = mapped_column(Double, index=True, nullable=False)
@@ -0,0 +1,16 @@
+from .segmented import SegmentedDownloader
+from .manifest import DownloadManifest, DownloadSegment
+from .mp4 import MP4Info, probe_mp4, probe_mp4_file, probe_mp4_url
+from .exceptions import DownloadException
+
+
+__all__ = (
+    "SegmentedDownloader",
+    "DownloadManifest",
+    "DownloadSegment",
+    "MP4Info",
+    "probe_mp4",
+    "probe_mp4_file",
+    "probe_mp4_url",
+    "DownloadException",
+)
@@ -0,0 +1,85 @@
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import simplejson as json
+import os
+
+
+MANIFEST_SUFFIX = ".manifest.json"
+
+
+@dataclass(slots=True)
+class DownloadSegment:
+    start: int
+    offset: int
+    end: int
+
+    @property
+    def is_done(self) -> bool:
+        return self.offset >= self.end
+
+
+@dataclass(slots=True)
+class DownloadManifest:
+    content_length: int
+    etag: str | None
+    last_modified: str | None
+    segments: list[DownloadSegment] = field(default_factory=list[DownloadSegment])
+
+    @staticmethod
+    def get_path(path: Path) -> Path:
+        return path.with_name(path.name + MANIFEST_SUFFIX)
+
+    def matches(self, content_length: int, etag: str | None, last_modified: str | None) -> bool:
+        if self.content_length != content_length:
+            return False
+
+        if self.etag is not None or etag is not None:
+            return self.etag == etag
+
+        return self.last_modified is not None and self.last_modified == last_modified
+
+    @classmethod
+    def load(cls, path: Path) -> "DownloadManifest | None":
+        manifest_path = cls.get_path(path)
+
+        if not path.exists() or not manifest_path.exists():
+            return None
+
+        try:
+            data = json.loads(manifest_path.read_text())
+
+            return cls(
+                content_length = data["content_length"],
+                etag = data["etag"],
+                last_modified = data["last_modified"],
+                segments = [
+                    DownloadSegment(*segment)
+                    for segment in data["segments"]
+                ]
+            )
+
+        except (ValueError, KeyError, TypeError):
+            return None
+
+    def save(self, path: Path) -> None:
+        manifest_path = self.get_path(path)
+        temp_manifest_path = manifest_path.with_name(manifest_path.name + ".tmp")
+
+        temp_manifest_path.write_text(json.dumps(dict(
+            content_length = self.content_length,
+            etag = self.etag,
+            last_modified = self.last_modified,
+            segments = [
+                (segment.start, segment.offset, segment.end)
+                for segment in self.segments
+            ]
+        )))
+
+        os.replace(temp_manifest_path, manifest_path)
+
+    @classmethod
+    def remove(cls, path: Path) -> None:
+        cls.get_path(path).unlink(
+            missing_ok = True
+        )
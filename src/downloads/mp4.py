@@ -0,0 +1,175 @@
+from collections import deque
+from dataclasses import dataclass
+from httpx import AsyncClient
+from pathlib import Path
+
+import mmap
+import struct
+import typing
+
+from .exceptions import DownloadException
+
+
+MOOV_MAX_SIZE = 1024 * 1024 * 64  # 64 MB
+ATOM_HEADER_SIZE = 8
+ATOM_LARGE_HEADER_SIZE = 16
+CONTAINER_ATOM_TYPES = (b"moov", b"trak")
+
+
+ReadAt = typing.Callable[[int, int], typing.Awaitable[bytes]]
+
+
+@dataclass(frozen=True, slots=True)
+class MP4Info:
+    width: int | None = None
+    height: int | None = None
+    duration: int | None = None
+    faststart: bool | None = None
+
+
+def _parse_atom_header(data: bytes, offset: int, end: int) -> tuple[bytes, int, int] | None:
+    data_end = min(end, len(data))
+
+    if offset + ATOM_HEADER_SIZE > data_end:
+        return None
+
+    atom_size, atom_type = struct.unpack_from(">I4s", data, offset)
+    header_size = ATOM_HEADER_SIZE
+
+    if atom_size == 1:
+        if offset + ATOM_LARGE_HEADER_SIZE > data_end:
+            return None
+
+        atom_size = struct.unpack_from(">Q", data, offset + ATOM_HEADER_SIZE)[0]
+        header_size = ATOM_LARGE_HEADER_SIZE
+
+    elif atom_size == 0:
+        atom_size = end - offset
+
+    if atom_size < header_size:
+        return None
+
+    return (atom_type, header_size, atom_size)
+
+
+def _iter_atoms(data: bytes, offset: int, end: int) -> typing.Iterator[tuple[bytes, int, int]]:
+    while offset < end:
+        atom_header = _parse_atom_header(data, offset, end)
+
+        if atom_header is None:
+            return
+
+        atom_type, header_size, atom_size = atom_header
+
+        yield (atom_type, offset + header_size, min(offset + atom_size, end))
+
+        offset += atom_size
+
+
+def _parse_moov(data: bytes) -> tuple[int | None, int | None, int | None]:
+    width: int | None = None
+    height: int | None = None
+    duration: int | None = None
+
+    pending_ranges = deque([(0, len(data))])
+
+    while pending_ranges:
+        start, end = pending_ranges.popleft()
+
+        for atom_type, data_start, data_end in _iter_atoms(data, start, end):
+            if atom_type in CONTAINER_ATOM_TYPES:
+                pending_ranges.append((data_start, data_end))
+
+            elif atom_type == b"mvhd" and data_end - data_start >= 20:
+                if data[data_start] == 1 and data_end - data_start >= 32:
+                    timescale, movie_duration = struct.unpack_from(">IQ", data, data_start + 20)
+                else:
+                    timescale, movie_duration = struct.unpack_from(">II", data, data_start + 12)
+
+                if timescale:
+                    duration = round(movie_duration / timescale)
+
+            elif atom_type == b"tkhd" and width is None and data_end - data_start >= 84:
+                # NOTE: 16.16 fixed-point width and height close both tkhd versions; audio tracks have them zeroed
+                track_width, track_height = struct.unpack_from(">II", data, data_end - 8)
+
+                if track_width and track_height:
+                    width = track_width >> 16
+                    height = track_height >> 16
+
+    return (width, height, duration)
+
+
+async def probe_mp4(read_at: ReadAt, size: int) -> MP4Info:
+    offset = 0
+    mdat_found = False
+
+    while offset < size:
+        header = await read_at(offset, ATOM_LARGE_HEADER_SIZE)
+        atom_header = _parse_atom_header(header, 0, size - offset)
+
+        if atom_header is None:
+            break
+
+        atom_type, header_size, atom_size = atom_header
+
+        if atom_type == b"mdat":
+            mdat_found = True
+
+        elif atom_type == b"moov":
+            if atom_size > MOOV_MAX_SIZE:
+                break
+
+            moov_data = await read_at(offset + header_size, atom_size - header_size)
+
+            width, height, duration = _parse_moov(moov_data)
+
+            return MP4Info(
+                width = width,
+                height = height,
+                duration = duration,
+                faststart = not mdat_found
+            )
+
+        offset += atom_size
+
+    return MP4Info()
+
+
+async def probe_mp4_file(path: Path) -> MP4Info:
+    with path.open("rb") as file:
+        size = path.stat().st_size
+
+        if not size:
+            return MP4Info()
+
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped_file:
+            async def read_at(offset: int, read_size: int) -> bytes:
+                return mapped_file[offset:offset + read_size]
+
+            return await probe_mp4(read_at, size)
+
+
+async def probe_mp4_url(http_client: AsyncClient, url: str, size: int) -> MP4Info:
+    async def read_at(offset: int, read_size: int) -> bytes:
+        data = bytearray()
+
+        async with http_client.stream(
+            "GET",
+            url,
+            headers = {"Range": "bytes={}-{}".format(offset, offset + read_size - 1)}
+        ) as response:
+            response.raise_for_status()
+
+            if response.status_code != 206:
+                raise DownloadException(f"Range requests are not honoured: HTTP {response.status_code}")
+
+            async for chunk in response.aiter_bytes():
+                data += chunk[:read_size - len(data)]
+
+                if len(data) >= read_size:
+                    break
+
+        return bytes(data)
+
+    return await probe_mp4(read_at, size)
@@ -0,0 +1,208 @@
+from httpx import AsyncClient, HTTPError
+from pathlib import Path
+
+import asyncio
+import os
+import typing
+
+from .exceptions import DownloadException
+from .manifest import DownloadManifest, DownloadSegment
+
+
+DOWNLOAD_SEGMENT_MIN_SIZE = 1024 * 1024 * 16  # 16 MB
+DOWNLOAD_CHUNK_SIZE = 1024 * 256  # 256 KB
+DOWNLOAD_RETRY_DELAY = 1.
+DOWNLOAD_MANIFEST_SAVE_DELAY = 5.
+
+
+ProgressCallback = typing.Callable[[int, int], None]
+
+
+class SegmentedDownloader:
+    def __init__(
+        self,
+        http_client: AsyncClient,
+        segments: int,
+        retries: int,
+        segment_min_size: int = DOWNLOAD_SEGMENT_MIN_SIZE
+    ) -> None:
+        self._http_client = http_client
+        self._segments = max(segments, 1)
+        self._retries = retries
+        self._segment_min_size = segment_min_size
+
+    async def _get_content_info(self, url: str) -> tuple[int | None, bool, str | None, str | None]:
+        response = await self._http_client.head(url)
+
+        response.raise_for_status()
+
+        content_length = response.headers.get("Content-Length")
+
+        return (
+            int(content_length) if content_length is not None else None,
+            response.headers.get("Accept-Ranges", "").lower() == "bytes",
+            response.headers.get("ETag"),
+            response.headers.get("Last-Modified")
+        )
+
+    def _get_segments(self, content_length: int) -> list[DownloadSegment]:
+        segments_count = max(min(self._segments, content_length // self._segment_min_size), 1)
+        segment_size = -(-content_length // segments_count)
+
+        return [
+            DownloadSegment(
+                start = start,
+                offset = start,
+                end = min(start + segment_size, content_length)
+            )
+            for start in range(0, content_length, segment_size)
+        ]
+
+    async def _download_segment(
+        self,
+        url: str,
+        fd: int,
+        segment: DownloadSegment,
+        on_chunk: typing.Callable[[int], None]
+    ) -> None:
+        attempt = 0
+
+        while not segment.is_done:
+            try:
+                async with self._http_client.stream("GET", url, headers={"Range": "bytes={}-{}".format(segment.offset, segment.end - 1)}) as response:
+                    response.raise_for_status()
+
+                    if response.status_code != 206:
+                        raise DownloadException(f"Range requests are not honoured: HTTP {response.status_code}")
+
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        os.pwrite(fd, chunk, segment.offset)
+
+                        segment.offset += len(chunk)
+
+                        on_chunk(len(chunk))
+
+                if not segment.is_done:
+                    raise DownloadException(f"Segment {segment.start}-{segment.end} ended at {segment.offset}")
+
+            except (HTTPError, DownloadException):
+                if attempt >= self._retries:
+                    raise
+
+                attempt += 1
+
+                await asyncio.sleep(DOWNLOAD_RETRY_DELAY * attempt)
+
+    async def _download_stream(self, url: str, fd: int, on_chunk: typing.Callable[[int], None]) -> None:
+        offset = 0
+
+        async with self._http_client.stream("GET", url) as response:
+            response.raise_for_status()
+
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                os.pwrite(fd, chunk, offset)
+
+                offset += len(chunk)
+
+                on_chunk(len(chunk))
+
+    async def _save_manifest(self, fd: int, path: Path, manifest: DownloadManifest) -> None:
+        snapshot = DownloadManifest(
+            content_length = manifest.content_length,
+            etag = manifest.etag,
+            last_modified = manifest.last_modified,
+            segments = [
+                DownloadSegment(segment.start, segment.offset, segment.end)
+                for segment in manifest.segments
+            ]
+        )
+
+        # NOTE: offsets are taken before the flush, so the manifest never claims bytes that may not be on disk yet
+        await asyncio.to_thread(os.fdatasync, fd)
+
+        snapshot.save(path)
+
+    async def _save_manifest_periodically(self, fd: int, path: Path, manifest: DownloadManifest) -> None:
+        while True:
+            await asyncio.sleep(DOWNLOAD_MANIFEST_SAVE_DELAY)
+
+            await self._save_manifest(fd, path, manifest)
+
+    async def download(self, url: str, path: Path, on_progress: ProgressCallback | None = None) -> int:
+        content_length, accepts_ranges, etag, last_modified = await self._get_content_info(url)
+
+        downloaded_size = 0
+
+        def on_chunk(size: int) -> None:
+            nonlocal downloaded_size
+
+            downloaded_size += size
+
+            if on_progress is not None:
+                on_progress(downloaded_size, content_length or 0)
+
+        if not content_length or not accepts_ranges:
+            DownloadManifest.remove(path)
+
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+
+            try:
+                await self._download_stream(url, fd, on_chunk)
+
+            finally:
+                os.close(fd)
+
+            return downloaded_size
+
+        manifest = DownloadManifest.load(path)
+
+        if manifest is None or not manifest.matches(content_length, etag, last_modified):
+            manifest = DownloadManifest(
+                content_length = content_length,
+                etag = etag,
+                last_modified = last_modified,
+                segments = self._get_segments(content_length)
+            )
+
+            fd = os.open(path, os.O_RDWR | os.O_CREAT | os.O_TRUNC, 0o644)
+
+        else:
+            fd = os.open(path, os.O_RDWR)
+
+            downloaded_size = sum(
+                segment.offset - segment.start
+                for segment in manifest.segments
+            )
+
+        try:
+            if hasattr(os, "posix_fallocate"):
+                os.posix_fallocate(fd, 0, content_length)
+            else:
+                os.ftruncate(fd, content_length)
+
+            tasks = [
+                asyncio.create_task(self._download_segment(url, fd, segment, on_chunk))
+                for segment in manifest.segments
+                if not segment.is_done
+            ]
+
+            save_manifest_task = asyncio.create_task(self._save_manifest_periodically(fd, path, manifest))
+
+            try:
+                await asyncio.gather(*tasks)
+
+            finally:
+                for task in (*tasks, save_manifest_task):
+                    task.cancel()
+
+                await asyncio.gather(*tasks, save_manifest_task, return_exceptions=True)
+
+                if not all(segment.is_done for segment in manifest.segments):
+                    await self._save_manifest(fd, path, manifest)
+
+        finally:
+            os.close(fd)
+
+        DownloadManifest.remove(path)
+
+        return downloaded_size
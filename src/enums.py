@@ -7,3 +7,10 @@ class CurrencyEnum(Enum):
 
 class PaymentPurposeEnum(Enum):
     SUBSCRIPTION = 0
+
+
+class RezkaRequestPriorityEnum(Enum):
+    INTERACTIVE = 0
+    DOWNLOAD = 1
+    TRACKER = 2
+    PREFETCH = 3
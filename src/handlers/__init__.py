@@ -1,4 +1,5 @@
 from .start import start_router
+from .admin import admin_router
 from .search import search_router
 from .payments import payments_router
 from .short_info import short_info_router
@@ -7,6 +8,7 @@ from .callback_query import callback_query_router
 
 ROUTERS = (
     start_router,
+    admin_router,
     search_router,
     payments_router,
     short_info_router,
@@ -0,0 +1,61 @@
+from aiogram import Router, types, filters, F
+
+import simplejson as json
+
+from src import utils, constants
+from src.rezka import ScheduledRezkaAPI
+from src.cache import AsyncTimedRezkaCacheData, AsyncTimedRezkaCacheShortInfo, AsyncTimedRezkaCacheSearch
+from src.basic_data import TEXTS
+from src.config import config
+
+
+admin_router = Router()
+admin_router.message.filter(F.from_user.id.in_(config.admins))
+
+
+@admin_router.message(filters.Command("cache_stats"))
+async def cache_stats_command_handler(
+    message: types.Message,
+    rezka_cache_data: AsyncTimedRezkaCacheData,
+    rezka_cache_short_info: AsyncTimedRezkaCacheShortInfo,
+    rezka_cache_search: AsyncTimedRezkaCacheSearch,
+    rezka_api: ScheduledRezkaAPI
+) -> None:
+    cache_stats = dict(
+        timestamp = utils.get_timestamp_int(),
+        rezka_api = rezka_api.get_stats_snapshot(),
+        rezka_cache_data = rezka_cache_data.get_stats_snapshot(),
+        rezka_cache_short_info = rezka_cache_short_info.get_stats_snapshot(),
+        rezka_cache_search = rezka_cache_search.get_stats_snapshot()
+    )
+
+    await message.answer_document(
+        document = types.BufferedInputFile(
+            file = json.dumps(cache_stats, indent=2).encode(constants.ENCODING),
+            filename = "cache_stats_{}.json".format(cache_stats["timestamp"])
+        )
+    )
+
+
+@admin_router.message(filters.Command("cache_invalidate"))
+async def cache_invalidate_command_handler(
+    message: types.Message,
+    command: filters.CommandObject,
+    rezka_cache_data: AsyncTimedRezkaCacheData
+) -> None:
+    args = (command.args or "").split()
+
+    if not 1 <= len(args) <= 2:
+        await message.answer(
+            text = TEXTS.cache_invalidate.usage
+        )
+
+        return
+
+    removed_count = await rezka_cache_data.invalidate_item(*args)
+
+    await message.answer(
+        text = TEXTS.cache_invalidate.done.format(
+            removed_count = removed_count
+        )
+    )
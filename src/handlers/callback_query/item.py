@@ -2,8 +2,9 @@ from aiogram import types
 from urllib.parse import quote
 
 import sqlalchemy as sa
+import asyncio
 
-from src import db, encrypt_utils, utils, keyboards, constants
+from src import db, encrypt_utils, utils, keyboards, constants, models, rezka
 from src.cache import AsyncTimedRezkaCacheData, AsyncTimedRezkaCacheShortInfo
 from src.basic_data import TEXTS, KB_TEXTS
 from src.config import config
@@ -58,6 +59,8 @@ async def item_callback_query_handler(
 
     args = all_args[2:]
 
+    rezka.set_request_hedging(True)
+
     item_id = args[0]
     is_film = bool(int(args[1]))
 
@@ -108,13 +111,21 @@ async def item_callback_query_handler(
 
         translator_title = translator_title_temp
 
+        force_refresh = len(args) == 4
+
+        force_refresh_allowed = rezka_cache_data.can_force_refresh(models.CachedRezkaData.get_key(
+            item_id = item_id,
+            translator_id = translator_id
+        ))
+
         got_cached_rezka_data = await rezka_cache_data.get_or_set(
             item_id = item_id,
             item_title = title,
             translator_id = translator_id,
             translator_title = translator_title,
             translator_additional_arguments = translator_additional_arguments,
-            is_film = is_film
+            is_film = is_film,
+            force_refresh = force_refresh
         )
 
         if is_film:
@@ -129,7 +140,7 @@ async def item_callback_query_handler(
 
                 return
 
-            got_cached_rezka_data.urls = _get_proxied_view_urls(
+            proxied_view_urls = _get_proxied_view_urls(
                 direct_urls = got_cached_rezka_data.urls,
                 item_id = item_id,
                 translator_id = translator_id,
@@ -137,13 +148,15 @@ async def item_callback_query_handler(
                 is_film = is_film
             )
 
+            got_cached_rezka_data = got_cached_rezka_data.with_urls(proxied_view_urls)
+
             await message.edit_text(
                 text = TEXTS.enjoy.default.format(
                     series_text = "",
                     translator = translator_title
                 ),
                 reply_markup = keyboards.direct_urls(
-                    direct_urls = got_cached_rezka_data.urls,
+                    direct_urls = proxied_view_urls,
                     is_film = is_film,
                     external_player_url = utils.get_external_player_url(
                         external_player_url = config.external_player_url,
@@ -160,9 +173,14 @@ async def item_callback_query_handler(
                 )
             )
 
-            if len(args) == 4:
+            if force_refresh:
                 await callback_query.answer(
-                    text = TEXTS.updated
+                    text = (
+                        TEXTS.updated
+                        if force_refresh_allowed
+                        else
+                        TEXTS.updated_recently
+                    )
                 )
 
             else:
@@ -426,24 +444,35 @@ async def item_callback_query_handler(
         if not translator_title:
             raise RuntimeError("Translator title not found")
 
-        got_cached_rezka_data = await rezka_cache_data.get_or_set(
+        force_refresh = len(args) == 6 and args[5] == "update"
+
+        force_refresh_allowed = rezka_cache_data.can_force_refresh(models.CachedRezkaData.get_key(
             item_id = item_id,
-            item_title = title,
             translator_id = translator_id,
-            translator_title = translator_title,
-            translator_additional_arguments = translator_additional_arguments,
-            is_film = is_film,
             season_id = season_id,
             episode_id = episode_id
-        )
+        ))
 
-        got_clean_cached_rezka_data = await rezka_cache_data.get_or_set(
-            item_id = item_id,
-            item_title = title,
-            translator_id = translator_id,
-            translator_title = translator_title,
-            translator_additional_arguments = translator_additional_arguments,
-            is_film = is_film
+        got_cached_rezka_data, got_clean_cached_rezka_data = await asyncio.gather(
+            rezka_cache_data.get_or_set(
+                item_id = item_id,
+                item_title = title,
+                translator_id = translator_id,
+                translator_title = translator_title,
+                translator_additional_arguments = translator_additional_arguments,
+                is_film = is_film,
+                season_id = season_id,
+                episode_id = episode_id,
+                force_refresh = force_refresh
+            ),
+            rezka_cache_data.get_or_set(
+                item_id = item_id,
+                item_title = title,
+                translator_id = translator_id,
+                translator_title = translator_title,
+                translator_additional_arguments = translator_additional_arguments,
+                is_film = is_film
+            )
         )
 
         season_index: int | None = None
@@ -479,7 +508,7 @@ async def item_callback_query_handler(
 
             return
 
-        got_cached_rezka_data.urls = _get_proxied_view_urls(
+        proxied_view_urls = _get_proxied_view_urls(
             direct_urls = got_cached_rezka_data.urls,
             item_id = item_id,
             translator_id = translator_id,
@@ -489,6 +518,8 @@ async def item_callback_query_handler(
             episode_id = episode_id
         )
 
+        got_cached_rezka_data = got_cached_rezka_data.with_urls(proxied_view_urls)
+
         await message.edit_text(
             text = TEXTS.enjoy.default.format(
                 series_text = TEXTS.enjoy.series.format(
@@ -498,7 +529,7 @@ async def item_callback_query_handler(
                 translator = translator_title
             ),
             reply_markup = keyboards.direct_urls(
-                direct_urls = got_cached_rezka_data.urls,
+                direct_urls = proxied_view_urls,
                 subtitles = got_cached_rezka_data.subtitles,
                 is_film = is_film,
                 external_player_url = utils.get_external_player_url(
@@ -555,9 +586,36 @@ async def item_callback_query_handler(
             )
         )
 
-        if len(args) == 6 and args[5] == "update":
+        prefetch_season_id: str | None = season_id
+        prefetch_episode_id: str | None = None
+
+        if episode_index < len(all_episodes[season_id]) - 1:
+            prefetch_episode_id = list(all_episodes[season_id].keys())[episode_index + 1]
+
+        elif season_index < len(seasons) - 1:
+            prefetch_season_id = list(seasons.keys())[season_index + 1]
+            prefetch_episode_id = next(iter(all_episodes.get(prefetch_season_id, {})), None)
+
+        if prefetch_episode_id is not None:
+            rezka_cache_data.prefetch(
+                item_id = item_id,
+                item_title = title,
+                translator_id = translator_id,
+                translator_title = translator_title,
+                translator_additional_arguments = translator_additional_arguments,
+                is_film = is_film,
+                season_id = prefetch_season_id,
+                episode_id = prefetch_episode_id
+            )
+
+        if force_refresh:
             await callback_query.answer(
-                text = TEXTS.updated
+                text = (
+                    TEXTS.updated
+                    if force_refresh_allowed
+                    else
+                    TEXTS.updated_recently
+                )
             )
 
             return
@@ -1,22 +1,19 @@
 from aiogram import Router, types
-from rezka_api_sdk import RezkaAPI
 
-import hashlib
-
-from src import constants
-from src.basic_data import TEXTS
+from src.cache import AsyncTimedRezkaCacheSearch
 from src.config import config
 
 
+SEARCH_PREFIX_RESULTS_CACHE_TIME = 5
+
+
 search_router = Router()
 
 
 @search_router.inline_query()
-async def search_inline_query(inline_query: types.InlineQuery, rezka_api: RezkaAPI) -> None:
+async def search_inline_query(inline_query: types.InlineQuery, rezka_cache_search: AsyncTimedRezkaCacheSearch) -> None:
     query = inline_query.query.strip()
 
-    results: list[types.InlineQueryResult] = []
-
     if not query:
         await inline_query.answer(
             results = [],
@@ -25,31 +22,17 @@ async def search_inline_query(inline_query: types.InlineQuery, rezka_api: RezkaA
 
         return
 
-    search_results = await rezka_api.search(query)
-
-    for search_result in search_results:
-        results.append(
-            types.InlineQueryResultArticle(
-                id = hashlib.md5(
-                    string = search_result.id.encode(constants.ENCODING)
-                ).hexdigest(),
-                title = search_result.title,
-                input_message_content = types.InputTextMessageContent(
-                    message_text = TEXTS.inline_search.message_content.format(
-                        image_url = search_result.image_url,
-                        title = search_result.title,
-                        url = search_result.url
-                    )
-                ),
-                description = TEXTS.inline_search.result_description.format(
-                    entity_text = constants.ENTITY_TYPE_TO_TEXT[search_result.entity_type.value],
-                    addition = search_result.addition
-                ),
-                thumb_url = search_result.image_url
-            )
+    prefix_results = rezka_cache_search.get_by_prefix(query)
+
+    if prefix_results is not None:
+        await inline_query.answer(
+            results = prefix_results,  # type: ignore
+            cache_time = SEARCH_PREFIX_RESULTS_CACHE_TIME
         )
 
+        return
+
     await inline_query.answer(
-        results = results,  # type: ignore
+        results = await rezka_cache_search.get_or_set(query),  # type: ignore
         cache_time = config.inline_query_cache_time
     )
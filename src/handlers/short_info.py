@@ -2,7 +2,7 @@ from aiogram import Router, types, Bot, enums as aiogram_enums
 
 import sqlalchemy as sa
 
-from src import db, utils, keyboards
+from src import db, utils, keyboards, rezka
 from src.cache import AsyncTimedRezkaCacheShortInfo
 from src.basic_data import TEXTS
 from .start import start_command_handler
@@ -35,6 +35,8 @@ async def via_bot_message_handler(
 
     _, url = utils.parse_item_message(message)
 
+    rezka.set_request_hedging(True)
+
     short_info, translators = await rezka_cache_short_info.get_or_set(url)
 
     item_id = utils.rezka_extract_id_from_url(url)
@@ -1,14 +1,37 @@
-from pydantic import BaseModel, Field
+from dataclasses import dataclass, field, fields, asdict, replace
 from rezka_api_sdk.models import DirectURLsModel
 from typing_extensions import Self
 
+import sys
+import typing
 
-class CachedRezkaData(BaseModel):
+
+def _intern_keys(data: dict[str, str] | None) -> dict[str, str] | None:
+    if data is None:
+        return None
+
+    return {
+        sys.intern(key): value
+        for key, value in data.items()
+    }
+
+
+def _intern_labels(data: dict[str, str] | None) -> dict[str, str] | None:
+    if data is None:
+        return None
+
+    return {
+        sys.intern(key): sys.intern(value)
+        for key, value in data.items()
+    }
+
+
+@dataclass(slots=True)
+class CachedRezkaData:
     item_id: str
     item_title: str
     translator_id: str
     translator_title: str
-    translator_additional_arguments: dict[str, str] = Field(default_factory=dict)
     is_film: bool
     season_id: str | None
     episode_id: str | None
@@ -17,6 +40,15 @@ class CachedRezkaData(BaseModel):
     urls: dict[str, str] | None
     subtitles: dict[str, str] | None
     subtitle_languages: dict[str, str] | None
+    translator_additional_arguments: dict[str, str] = field(default_factory=dict[str, str])
+    urls_expires_at: float | None = None
+
+    @property
+    def is_empty(self) -> bool:
+        if self.is_film or self.episode_id is not None:
+            return not self.urls
+
+        return not self.seasons
 
     @staticmethod
     def get_key(
@@ -46,20 +78,53 @@ class CachedRezkaData(BaseModel):
         is_film: bool,
         response: DirectURLsModel,
         season_id: str | None = None,
-        episode_id: str | None = None
+        episode_id: str | None = None,
+        urls_expires_at: float | None = None
     ) -> Self:
+        is_episode = episode_id is not None
+
         return cls(
-            item_id = item_id,
-            item_title = item_title,
-            translator_id = translator_id,
-            translator_title = translator_title,
+            item_id = sys.intern(item_id),
+            item_title = sys.intern(item_title),
+            translator_id = sys.intern(translator_id),
+            translator_title = sys.intern(translator_title),
             translator_additional_arguments = translator_additional_arguments,
             is_film = is_film,
             season_id = season_id,
             episode_id = episode_id,
-            seasons = response.seasons,
-            episodes = response.episodes,
-            urls = response.urls,
-            subtitles = response.subtitles,
-            subtitle_languages = response.subtitle_languages
+            seasons = (
+                None
+                if is_episode
+                else
+                _intern_labels(response.seasons)
+            ),
+            episodes = (
+                None
+                if is_episode or response.episodes is None
+                else
+                {
+                    sys.intern(season_id_): _intern_labels(episodes)  # type: ignore
+                    for season_id_, episodes in response.episodes.items()
+                }
+            ),
+            urls = _intern_keys(response.urls),
+            subtitles = _intern_keys(response.subtitles),
+            subtitle_languages = _intern_labels(response.subtitle_languages),
+            urls_expires_at = urls_expires_at
         )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, typing.Any]) -> Self:
+        field_names = {field_.name for field_ in fields(cls)}
+
+        return cls(**{
+            key: value
+            for key, value in data.items()
+            if key in field_names
+        })
+
+    def to_dict(self) -> dict[str, typing.Any]:
+        return asdict(self)
+
+    def with_urls(self, urls: dict[str, str]) -> Self:
+        return replace(self, urls=urls)
@@ -0,0 +1,34 @@
+from .scheduler import (
+    RezkaRequestScheduler,
+    RequestPriorityHandle,
+    TokenBucket,
+    get_request_priority,
+    set_request_priority,
+    set_request_priority_handle,
+    request_priority,
+)
+from .health import LatencyTracker, CircuitBreaker
+from .hedging import HedgeBudget, is_request_hedging, set_request_hedging
+from .upstreams import RezkaUpstream, RezkaUpstreamPool
+from .exceptions import RezkaAPIUnavailableException
+from .client import ScheduledRezkaAPI
+
+
+__all__ = (
+    "RezkaRequestScheduler",
+    "RequestPriorityHandle",
+    "TokenBucket",
+    "get_request_priority",
+    "set_request_priority",
+    "set_request_priority_handle",
+    "request_priority",
+    "LatencyTracker",
+    "CircuitBreaker",
+    "HedgeBudget",
+    "is_request_hedging",
+    "set_request_hedging",
+    "RezkaUpstream",
+    "RezkaUpstreamPool",
+    "RezkaAPIUnavailableException",
+    "ScheduledRezkaAPI",
+)
@@ -0,0 +1,275 @@
+from rezka_api_sdk import RezkaAPI, RezkaAPIException
+from rezka_api_sdk.rezka_api import HTTPMethods
+from time import perf_counter
+
+import asyncio
+import httpx
+import typing
+
+from src import enums
+from .exceptions import RezkaAPIUnavailableException
+from .health import LatencyTracker, CircuitBreaker
+from .hedging import HedgeBudget, is_request_hedging
+from .scheduler import RezkaRequestScheduler, get_request_priority
+from .upstreams import RezkaUpstream, RezkaUpstreamPool
+
+
+TIMEOUT_PERCENTILE = 99
+TIMEOUT_PERCENTILE_MULTIPLIER = 2.
+
+
+class _EndpointHealth:
+    def __init__(self, breaker_failure_threshold: int, breaker_reset_time: float) -> None:
+        self.latency = LatencyTracker()
+        self.breaker = CircuitBreaker(
+            failure_threshold = breaker_failure_threshold,
+            reset_time = breaker_reset_time
+        )
+
+
+class ScheduledRezkaAPI(RezkaAPI):
+    def __init__(
+        self,
+        api_key: str,
+        scheduler: RezkaRequestScheduler,
+        timeout_min: float,
+        timeout_max: float,
+        breaker_failure_threshold: int,
+        breaker_reset_time: float,
+        hedge_percentile: float | None = None,
+        hedge_budget_ratio: float = 0.,
+        api_urls: list[str] | None = None,
+        **http_client_kwargs: typing.Any
+    ) -> None:
+        super().__init__(
+            api_key,
+            timeout = timeout_max,
+            **http_client_kwargs
+        )
+
+        self.scheduler = scheduler
+
+        self._upstream_pool = RezkaUpstreamPool(api_urls or [self.API_URL])
+
+        # NOTE: the SDK builds request urls as `API_URL + method`, so the chosen upstream url is passed in `method`
+        self.API_URL = ""
+
+        self._timeout_min = timeout_min
+        self._timeout_max = timeout_max
+        self._breaker_failure_threshold = breaker_failure_threshold
+        self._breaker_reset_time = breaker_reset_time
+        self._hedge_percentile = hedge_percentile
+        self._hedge_budget = HedgeBudget(
+            ratio = hedge_budget_ratio
+        )
+
+        self._endpoints_health: dict[str, _EndpointHealth] = {}
+
+    def _get_endpoint_health(self, method: str) -> _EndpointHealth:
+        endpoint_health = self._endpoints_health.get(method)
+
+        if endpoint_health is None:
+            endpoint_health = self._endpoints_health[method] = _EndpointHealth(
+                breaker_failure_threshold = self._breaker_failure_threshold,
+                breaker_reset_time = self._breaker_reset_time
+            )
+
+        return endpoint_health
+
+    def _get_timeout(self, endpoint_health: _EndpointHealth) -> float:
+        latency = endpoint_health.latency.get_percentile(TIMEOUT_PERCENTILE)
+
+        if latency is None:
+            return self._timeout_max
+
+        return min(max(latency * TIMEOUT_PERCENTILE_MULTIPLIER, self._timeout_min), self._timeout_max)
+
+    async def _send_upstream_request(
+        self,
+        upstream: RezkaUpstream,
+        endpoint_health: _EndpointHealth,
+        args: tuple[typing.Any, ...],
+        kwargs: dict[str, typing.Any]
+    ) -> typing.Any:
+        method: str = kwargs["method"]
+        timeout = self._get_timeout(endpoint_health)
+        started_at = perf_counter()
+
+        try:
+            result = await asyncio.wait_for(
+                super()._request(
+                    *args,
+                    **{
+                        **kwargs,
+                        "method": upstream.url + method
+                    }
+                ),
+                timeout
+            )
+
+        except (asyncio.TimeoutError, httpx.TimeoutException) as ex:
+            endpoint_health.latency.observe(perf_counter() - started_at)
+            upstream.record_failure()
+
+            raise RezkaAPIUnavailableException(f"{method} timed out after {timeout:.1f}s on {upstream.url}") from ex
+
+        except httpx.TransportError as ex:
+            upstream.record_failure()
+
+            raise RezkaAPIUnavailableException(f"{method} transport error on {upstream.url}: {ex!r}") from ex
+
+        except RezkaAPIException as ex:
+            if ex.status_code >= 500:
+                upstream.record_failure()
+
+                raise RezkaAPIUnavailableException(ex.description, ex.status_code) from ex
+
+            latency = perf_counter() - started_at
+
+            endpoint_health.latency.observe(latency)
+            upstream.record_success(latency)
+
+            raise
+
+        latency = perf_counter() - started_at
+
+        endpoint_health.latency.observe(latency)
+        upstream.record_success(latency)
+
+        return result
+
+    async def _send_request(self, endpoint_health: _EndpointHealth, args: tuple[typing.Any, ...], kwargs: dict[str, typing.Any]) -> typing.Any:
+        tried_upstreams: list[RezkaUpstream] = []
+
+        async with self.scheduler.slot():
+            while True:
+                upstream = self._upstream_pool.select(
+                    exclude = tried_upstreams
+                )
+
+                if upstream is None:
+                    break
+
+                tried_upstreams.append(upstream)
+
+                try:
+                    result = await self._send_upstream_request(upstream, endpoint_health, args, kwargs)
+
+                except RezkaAPIUnavailableException:
+                    if len(tried_upstreams) < len(self._upstream_pool.upstreams):
+                        continue
+
+                    endpoint_health.breaker.record_failure()
+
+                    raise
+
+                except RezkaAPIException:
+                    endpoint_health.breaker.record_success()
+
+                    raise
+
+                endpoint_health.breaker.record_success()
+
+                return result
+
+        raise RezkaAPIUnavailableException("No Rezka API upstreams")
+
+    async def check_upstreams(self) -> None:
+        for upstream in self._upstream_pool.upstreams:
+            started_at = perf_counter()
+
+            try:
+                await asyncio.wait_for(
+                    super()._request(
+                        http_method = HTTPMethods.GET,
+                        method = upstream.url + "me"
+                    ),
+                    self._timeout_max
+                )
+
+            except (asyncio.TimeoutError, httpx.HTTPError):
+                upstream.record_failure()
+
+                continue
+
+            except RezkaAPIException as ex:
+                if ex.status_code >= 500:
+                    upstream.record_failure()
+
+                    continue
+
+            upstream.record_success(perf_counter() - started_at)
+
+    def _get_hedge_delay(self, endpoint_health: _EndpointHealth) -> float | None:
+        if self._hedge_percentile is None or not is_request_hedging() or get_request_priority() != enums.RezkaRequestPriorityEnum.INTERACTIVE:
+            return None
+
+        self._hedge_budget.record_request()
+
+        return endpoint_health.latency.get_percentile(self._hedge_percentile)
+
+    async def _send_hedged_request(self, endpoint_health: _EndpointHealth, hedge_delay: float, args: tuple[typing.Any, ...], kwargs: dict[str, typing.Any]) -> typing.Any:
+        primary_task = asyncio.create_task(self._send_request(endpoint_health, args, kwargs))
+        tasks = [primary_task]
+
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=hedge_delay)
+
+            if not done and self._hedge_budget.try_spend():
+                tasks.append(asyncio.create_task(self._send_request(endpoint_health, args, kwargs)))
+
+            pending = set(tasks)
+
+            while True:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+
+                succeeded = [
+                    task
+                    for task in done
+                    if task.exception() is None
+                ]
+
+                if not succeeded and pending:
+                    continue
+
+                winner_task = (succeeded or list(done))[0]
+
+                if winner_task is not primary_task:
+                    self._hedge_budget.hedges_won_count += 1
+
+                return winner_task.result()
+
+        finally:
+            for task in tasks:
+                task.cancel()
+
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _request(self, *args: typing.Any, **kwargs: typing.Any) -> typing.Any:
+        method: str = kwargs["method"]
+        endpoint_health = self._get_endpoint_health(method)
+
+        if not endpoint_health.breaker.allow_request():
+            raise RezkaAPIUnavailableException(f"Circuit for {method} is open")
+
+        hedge_delay = self._get_hedge_delay(endpoint_health)
+
+        if hedge_delay is None:
+            return await self._send_request(endpoint_health, args, kwargs)
+
+        return await self._send_hedged_request(endpoint_health, hedge_delay, args, kwargs)
+
+    def get_stats_snapshot(self) -> dict[str, typing.Any]:
+        return dict(
+            scheduler = self.scheduler.get_stats_snapshot(),
+            hedge_budget = self._hedge_budget.snapshot(),
+            upstreams = self._upstream_pool.snapshot(),
+            endpoints = {
+                method: dict(
+                    timeout = self._get_timeout(endpoint_health),
+                    latency = endpoint_health.latency.snapshot(),
+                    breaker = endpoint_health.breaker.snapshot()
+                )
+                for method, endpoint_health in self._endpoints_health.items()
+            }
+        )
@@ -0,0 +1,9 @@
+from rezka_api_sdk import RezkaAPIException
+
+
+class RezkaAPIUnavailableException(RezkaAPIException):
+    def __init__(self, description: str | None = None, status_code: int = 503) -> None:
+        super().__init__(
+            status_code = status_code,
+            description = description
+        )
@@ -0,0 +1,74 @@
+from collections import deque
+from time import monotonic
+
+import math
+import typing
+
+
+LATENCY_WINDOW_SIZE = 200
+LATENCY_MIN_SAMPLES = 20
+
+
+class LatencyTracker:
+    def __init__(self, window_size: int = LATENCY_WINDOW_SIZE) -> None:
+        self._samples: deque[float] = deque(maxlen=window_size)
+
+    def observe(self, value: float) -> None:
+        self._samples.append(value)
+
+    def get_percentile(self, percentile: float) -> float | None:
+        if len(self._samples) < LATENCY_MIN_SAMPLES:
+            return None
+
+        samples = sorted(self._samples)
+
+        return samples[min(len(samples) - 1, math.ceil(len(samples) * percentile / 100) - 1)]
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return dict(
+            samples = len(self._samples),
+            p50 = self.get_percentile(50),
+            p95 = self.get_percentile(95),
+            p99 = self.get_percentile(99)
+        )
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_time: float) -> None:
+        self._failure_threshold = failure_threshold
+        self._reset_time = reset_time
+        self._failures_count = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        return self._opened_at is not None
+
+    def allow_request(self) -> bool:
+        if self._opened_at is None:
+            return True
+
+        current_time = monotonic()
+
+        if current_time - self._opened_at < self._reset_time:
+            return False
+
+        self._opened_at = current_time
+
+        return True
+
+    def record_success(self) -> None:
+        self._failures_count = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        self._failures_count += 1
+
+        if self._opened_at is None and self._failures_count >= self._failure_threshold:
+            self._opened_at = monotonic()
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return dict(
+            is_open = self.is_open,
+            failures_count = self._failures_count
+        )
@@ -0,0 +1,46 @@
+from contextvars import ContextVar
+
+import typing
+
+
+HEDGE_BUDGET_MAX_CREDIT = 10.
+
+
+_request_hedging: ContextVar[bool] = ContextVar("rezka_request_hedging", default=False)
+
+
+def is_request_hedging() -> bool:
+    return _request_hedging.get()
+
+
+def set_request_hedging(hedging: bool) -> None:
+    _request_hedging.set(hedging)
+
+
+class HedgeBudget:
+    def __init__(self, ratio: float, max_credit: float = HEDGE_BUDGET_MAX_CREDIT) -> None:
+        self._ratio = ratio
+        self._max_credit = max_credit
+        self._credit = 0.
+
+        self.hedges_count = 0
+        self.hedges_won_count = 0
+
+    def record_request(self) -> None:
+        self._credit = min(self._max_credit, self._credit + self._ratio)
+
+    def try_spend(self) -> bool:
+        if self._credit < 1.:
+            return False
+
+        self._credit -= 1.
+        self.hedges_count += 1
+
+        return True
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return dict(
+            credit = self._credit,
+            hedges_count = self.hedges_count,
+            hedges_won_count = self.hedges_won_count
+        )
@@ -0,0 +1,222 @@
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from time import monotonic, perf_counter
+
+import asyncio
+import heapq
+import itertools
+import typing
+
+from src import enums
+from src.cache.stats import LatencyHistogram
+
+
+_request_priority: ContextVar[enums.RezkaRequestPriorityEnum] = ContextVar(
+    "rezka_request_priority",
+    default = enums.RezkaRequestPriorityEnum.INTERACTIVE
+)
+
+
+_request_priority_handle: ContextVar["RequestPriorityHandle | None"] = ContextVar(
+    "rezka_request_priority_handle",
+    default = None
+)
+
+
+def get_request_priority() -> enums.RezkaRequestPriorityEnum:
+    priority_handle = _request_priority_handle.get()
+
+    if priority_handle is not None:
+        return priority_handle.priority
+
+    return _request_priority.get()
+
+
+def set_request_priority(priority: enums.RezkaRequestPriorityEnum) -> None:
+    _request_priority.set(priority)
+
+
+def set_request_priority_handle(priority_handle: "RequestPriorityHandle") -> None:
+    _request_priority_handle.set(priority_handle)
+
+
+@contextmanager
+def request_priority(priority: enums.RezkaRequestPriorityEnum) -> typing.Generator[None, None, None]:
+    token = _request_priority.set(priority)
+
+    try:
+        yield
+
+    finally:
+        _request_priority.reset(token)
+
+
+class RequestPriorityHandle:
+    def __init__(self, priority: enums.RezkaRequestPriorityEnum) -> None:
+        self.priority = priority
+
+        self._waiters: dict[asyncio.Future[None], "RezkaRequestScheduler"] = {}
+
+    def raise_priority(self, priority: enums.RezkaRequestPriorityEnum) -> None:
+        if priority.value >= self.priority.value:
+            return
+
+        self.priority = priority
+
+        for future, scheduler in self._waiters.items():
+            scheduler.requeue(future, priority)
+
+    def add_waiter(self, future: asyncio.Future[None], scheduler: "RezkaRequestScheduler") -> None:
+        self._waiters[future] = scheduler
+
+    def remove_waiter(self, future: asyncio.Future[None]) -> None:
+        self._waiters.pop(future, None)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate = rate
+        self._capacity = capacity
+        self._tokens = capacity
+        self._updated_at = monotonic()
+
+    def try_acquire(self) -> float:
+        current_time = monotonic()
+
+        self._tokens = min(self._capacity, self._tokens + (current_time - self._updated_at) * self._rate)
+        self._updated_at = current_time
+
+        if self._tokens >= 1.:
+            self._tokens -= 1.
+
+            return 0.
+
+        return (1. - self._tokens) / self._rate
+
+
+class RezkaRequestScheduler:
+    def __init__(
+        self,
+        max_concurrency: int,
+        rate_limit: float | None = None,
+        rate_burst: int = 1
+    ) -> None:
+        self._max_concurrency = max_concurrency
+        self._active_count = 0
+
+        self._waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self._waiters_sequence = itertools.count()
+
+        self._token_bucket = (
+            TokenBucket(
+                rate = rate_limit,
+                capacity = max(rate_burst, 1)
+            )
+            if rate_limit
+            else
+            None
+        )
+        self._dispatch_handle: asyncio.TimerHandle | None = None
+
+        self._wait_latency = {
+            priority: LatencyHistogram()
+            for priority in enums.RezkaRequestPriorityEnum
+        }
+
+    def _on_dispatch_timer(self) -> None:
+        self._dispatch_handle = None
+
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._waiters and self._active_count < self._max_concurrency:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+
+                continue
+
+            if self._token_bucket is not None:
+                delay = self._token_bucket.try_acquire()
+
+                if delay > 0.:
+                    if self._dispatch_handle is None:
+                        self._dispatch_handle = asyncio.get_running_loop().call_later(delay, self._on_dispatch_timer)
+
+                    return
+
+            _, _, future = heapq.heappop(self._waiters)
+
+            self._active_count += 1
+
+            future.set_result(None)
+
+    def _release(self) -> None:
+        self._active_count -= 1
+
+        self._dispatch()
+
+    def requeue(self, future: asyncio.Future[None], priority: enums.RezkaRequestPriorityEnum) -> None:
+        if not future.done():
+            heapq.heappush(self._waiters, (priority.value, next(self._waiters_sequence), future))
+
+    async def _acquire(self, priority: enums.RezkaRequestPriorityEnum, priority_handle: RequestPriorityHandle | None = None) -> None:
+        future: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+
+        heapq.heappush(self._waiters, (priority.value, next(self._waiters_sequence), future))
+
+        if priority_handle is not None:
+            priority_handle.add_waiter(future, self)
+
+        self._dispatch()
+
+        try:
+            await future
+
+        except asyncio.CancelledError:
+            # NOTE: the slot was granted right before the cancellation arrived
+            if future.done() and not future.cancelled():
+                self._release()
+
+            raise
+
+        finally:
+            if priority_handle is not None:
+                priority_handle.remove_waiter(future)
+
+    @asynccontextmanager
+    async def slot(self, priority: enums.RezkaRequestPriorityEnum | None = None) -> typing.AsyncGenerator[None, None]:
+        priority_handle: RequestPriorityHandle | None = None
+
+        if priority is None:
+            priority_handle = _request_priority_handle.get()
+            priority = get_request_priority()
+
+        started_at = perf_counter()
+
+        await self._acquire(priority, priority_handle)
+
+        if priority_handle is not None:
+            priority = priority_handle.priority
+
+        self._wait_latency[priority].observe(perf_counter() - started_at)
+
+        try:
+            yield
+
+        finally:
+            self._release()
+
+    def get_stats_snapshot(self) -> dict[str, typing.Any]:
+        return dict(
+            active = self._active_count,
+            queued = len({
+                future
+                for _, _, future in self._waiters
+                if not future.done()
+            }),
+            max_concurrency = self._max_concurrency,
+            wait_latency = {
+                priority.name.lower(): wait_latency.snapshot()
+                for priority, wait_latency in self._wait_latency.items()
+            }
+        )
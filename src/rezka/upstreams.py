@@ -0,0 +1,77 @@
+import typing
+
+
+UPSTREAM_EWMA_ALPHA = 0.3
+UPSTREAM_FAILURES_THRESHOLD = 3
+
+
+class RezkaUpstream:
+    def __init__(self, url: str) -> None:
+        self.url = (
+            url
+            if url.endswith("/")
+            else
+            url + "/"
+        )
+
+        self.ewma_latency: float | None = None
+        self.failures_count = 0
+
+    @property
+    def is_healthy(self) -> bool:
+        return self.failures_count < UPSTREAM_FAILURES_THRESHOLD
+
+    def record_success(self, latency: float) -> None:
+        self.ewma_latency = (
+            latency
+            if self.ewma_latency is None
+            else
+            UPSTREAM_EWMA_ALPHA * latency + (1 - UPSTREAM_EWMA_ALPHA) * self.ewma_latency
+        )
+
+        self.failures_count = 0
+
+    def record_failure(self) -> None:
+        self.failures_count += 1
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return dict(
+            is_healthy = self.is_healthy,
+            ewma_latency = self.ewma_latency,
+            failures_count = self.failures_count
+        )
+
+
+class RezkaUpstreamPool:
+    def __init__(self, urls: list[str]) -> None:
+        if not urls:
+            raise ValueError("At least one Rezka API url is required")
+
+        self.upstreams = [
+            RezkaUpstream(url)
+            for url in urls
+        ]
+
+    def select(self, exclude: list[RezkaUpstream]) -> RezkaUpstream | None:
+        candidates = [
+            upstream
+            for upstream in self.upstreams
+            if upstream not in exclude
+        ]
+
+        if not candidates:
+            return None
+
+        return min(
+            candidates,
+            key = lambda upstream: (
+                not upstream.is_healthy,
+                upstream.ewma_latency or 0.
+            )
+        )
+
+    def snapshot(self) -> dict[str, typing.Any]:
+        return {
+            upstream.url: upstream.snapshot()
+            for upstream in self.upstreams
+        }
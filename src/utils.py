@@ -2,17 +2,19 @@ from logging import Logger
 from logging.handlers import RotatingFileHandler
 from telegram_bot_logger import TelegramMessageHandler, formatters as logger_formatters
 from pathlib import Path
-from urllib.parse import urlparse
+from urllib.parse import urlparse, parse_qs
 from time import time
 from datetime import datetime, timezone
 from aiogram import types
-from rezka_api_sdk import models as rezka_models
+from rezka_api_sdk import RezkaAPIException, models as rezka_models
 
 import logging
+import hashlib
 import sys
 import typing
 
 from src import models, constants, encrypt_utils
+from src.basic_data import TEXTS
 
 
 DEFAULT_LOG_FORMAT = "%(asctime)s - [%(levelname)s] - %(name)s - (%(filename)s).%(funcName)s(%(lineno)d) - %(message)s"
@@ -95,6 +97,41 @@ def extract_digits_from_string(string: str) -> str:
     return "".join(filter(str.isdigit, string))
 
 
+def get_object_size(obj: typing.Any, _seen: set[int] | None = None) -> int:
+    if _seen is None:
+        _seen = set()
+
+    if id(obj) in _seen:
+        return 0
+
+    _seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+
+    if isinstance(obj, (str, bytes, int, float, bool)) or obj is None:
+        return size
+
+    if hasattr(obj, "__dict__"):
+        size += get_object_size(vars(obj), _seen)
+
+    obj_type: type = obj.__class__
+    slots: typing.Iterable[str] = getattr(obj_type, "__slots__", ())
+
+    for slot in slots:
+        if hasattr(obj, slot):
+            size += get_object_size(getattr(obj, slot), _seen)
+
+    if isinstance(obj, dict):
+        for key, value in typing.cast(dict[typing.Any, typing.Any], obj).items():
+            size += get_object_size(key, _seen) + get_object_size(value, _seen)
+
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        for value in typing.cast(typing.Iterable[typing.Any], obj):
+            size += get_object_size(value, _seen)
+
+    return size
+
+
 def get_timestamp_float() -> float:
     return time()
 
@@ -109,6 +146,55 @@ def timestamp_to_datetime(timestamp: int) -> datetime:
     return datetime.fromtimestamp(timestamp, timezone.utc)
 
 
+def normalize_search_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+def is_search_title_match(title: str, query: str) -> bool:
+    title_words = constants.SEARCH_WORD_PATTERN.findall(title.lower())
+    query_words = constants.SEARCH_WORD_PATTERN.findall(query.lower())
+
+    if not query_words:
+        return False
+
+    *full_query_words, last_query_word = query_words
+
+    for query_word in full_query_words:
+        if query_word not in title_words:
+            return False
+
+        title_words.remove(query_word)
+
+    return any(
+        title_word.startswith(last_query_word)
+        for title_word in title_words
+    )
+
+
+def get_inline_search_results(search_results: list[rezka_models.SearchResultModel]) -> list[types.InlineQueryResultArticle]:
+    return [
+        types.InlineQueryResultArticle(
+            id = hashlib.md5(
+                string = search_result.id.encode(constants.ENCODING)
+            ).hexdigest(),
+            title = search_result.title,
+            input_message_content = types.InputTextMessageContent(
+                message_text = TEXTS.inline_search.message_content.format(
+                    image_url = search_result.image_url,
+                    title = search_result.title,
+                    url = search_result.url
+                )
+            ),
+            description = TEXTS.inline_search.result_description.format(
+                entity_text = constants.ENTITY_TYPE_TO_TEXT[search_result.entity_type.value],
+                addition = search_result.addition
+            ),
+            thumb_url = search_result.image_url
+        )
+        for search_result in search_results
+    ]
+
+
 def parse_inline_translator_additional_arguments(translator_additional_arguments_str: str) -> dict[str, str]:
     translator_additional_arguments: dict[str, str] = dict()
 
@@ -149,6 +235,56 @@ def extract_series_data_from_message(message: types.Message) -> tuple[str, str]:
     return (result.group(1), result.group(2))
 
 
+def _is_plausible_direct_url_expiration_timestamp(timestamp: float) -> bool:
+    current_time = get_timestamp_float()
+
+    return current_time < timestamp < current_time + constants.DIRECT_URL_EXPIRATION_MAX_HORIZON
+
+
+def parse_direct_url_expiration_timestamp(url: str) -> float | None:
+    parsed_url = urlparse(url)
+    query = parse_qs(parsed_url.query)
+
+    for argument in constants.DIRECT_URL_EXPIRATION_QUERY_ARGUMENTS:
+        for value in query.get(argument, ()):
+            if value.isdigit() and _is_plausible_direct_url_expiration_timestamp(float(value)):
+                return float(value)
+
+    result = constants.DIRECT_URL_EXPIRATION_PATH_PATTERN.search(parsed_url.path)
+
+    if result:
+        try:
+            timestamp = datetime.strptime(result.group(1), "%Y%m%d%H").replace(tzinfo=constants.DIRECT_URL_EXPIRATION_PATH_TIMEZONE).timestamp()
+
+        except ValueError:
+            return None
+
+        if _is_plausible_direct_url_expiration_timestamp(timestamp):
+            return timestamp
+
+    return None
+
+
+def get_direct_urls_expiration_timestamp(direct_urls: dict[str, str] | None) -> float | None:
+    if not direct_urls:
+        return None
+
+    expiration_timestamps = [
+        expiration_timestamp
+        for expiration_timestamp in map(parse_direct_url_expiration_timestamp, direct_urls.values())
+        if expiration_timestamp is not None
+    ]
+
+    if not expiration_timestamps:
+        return None
+
+    return min(expiration_timestamps)
+
+
+def is_premium_content_exception(ex: Exception) -> bool:
+    return isinstance(ex, RezkaAPIException) and ex.description is not None and "premium content" in ex.description.lower()
+
+
 def get_external_player_url(
     external_player_url: str | None,
     item_id: str,